@@ -1,35 +1,116 @@
-from flask import Flask
-from flask_cors import CORS
-from config import Config
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+import time
 
+_import_started = time.perf_counter()
+
+from flask import Flask  # noqa: E402
+from flask_cors import CORS  # noqa: E402
+from config import Config  # noqa: E402
+from flask_limiter import Limiter  # noqa: E402
+from flask_limiter.util import get_remote_address  # noqa: E402
+
+from .metrics import init_metrics, record_rate_limit_breach  # noqa: E402
+from .startup import (  # noqa: E402
+    init_startup_report,
+    mark_ready,
+    record_phase,
+    startup_phase,
+)
+
+# Registers the mmap:// scheme used by RATELIMIT_STORAGE_URI
+from . import rate_limit_storage  # noqa: F401, E402
+
+# Storage and strategy come from RATELIMIT_STORAGE_URI / RATELIMIT_STRATEGY
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per minute", "30 per second"],
-    storage_uri="memory://",
+    on_breach=record_rate_limit_breach,
 )
 
+record_phase("import", _import_started)
+
 
 def create_app():
+    started = time.perf_counter()
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # Times the first request (registered first so it covers every hook)
+    init_startup_report(app)
+
+    # orjson-backed jsonify when available (JSON_PROVIDER)
+    from .json_provider import init_json_provider
+
+    init_json_provider(app)
+
     # Initialize CORS
     CORS(app)  # Allow all origins for now
 
+    # Request, query and pool metrics (registered first so 429s are timed too)
+    init_metrics(app)
+
+    # gzip / brotli response compression (COMPRESSION_*)
+    from .compression import init_compression
+
+    init_compression(app)
+
+    # Opt-in slow-query log (SLOW_QUERY_LOG=true)
+    from .slow_queries import init_slow_query_log
+
+    init_slow_query_log(app)
+
     # Initialize rate limiter
     limiter.init_app(app)
 
-    # Initialize database pool after app creation
+    # Configure the door catalog cache
+    from .cache import catalog_cache
+    from .models import checkout_timeout
+
+    catalog_cache.configure(
+        ttl=app.config["CATALOG_CACHE_TTL"],
+        max_entries=app.config["CATALOG_CACHE_MAX_ENTRIES"],
+        stale_ttl=app.config["CATALOG_CACHE_STALE_TTL"],
+        # A reload that can fall back to the stale copy doesn't queue for the
+        # pool for the full DB_POOL_TIMEOUT
+        stale_load_context=lambda: checkout_timeout(
+            app.config["CATALOG_CACHE_STALE_WAIT"]
+        ),
+    )
+
+    # Initialize database pool after app creation; with FAST_START the pool
+    # is created by the first request that touches the database instead
     with app.app_context():
-        from .models import init_db_pool
+        from .models import init_db_pool, release_request_connection
+
+        if not app.config["FAST_START"]:
+            with startup_phase("db_pool"):
+                init_db_pool()
 
-        init_db_pool()
+    # Return the request's shared connection to the pool
+    app.teardown_request(release_request_connection)
 
     # Register blueprints
-    from .routes import main
+    with startup_phase("routes"):
+        from .routes import main
+
+        app.register_blueprint(main)
+
+    # Schema migrations CLI (flask db upgrade / status / check-indexes / rebuild-stats)
+    from .migrate import db_cli
+
+    app.cli.add_command(db_cli)
+
+    # Email outbox CLI. The background dispatchers are started by the serving
+    # process (run.py, gunicorn.conf.py), not here, so CLI commands such as
+    # flask db upgrade never send email
+    from .outbox import outbox_cli
+
+    app.cli.add_command(outbox_cli)
+
+    # Newsletter campaign CLI
+    from .campaigns import campaigns_cli
 
-    app.register_blueprint(main)
+    app.cli.add_command(campaigns_cli)
 
+    record_phase("create_app", started)
+    mark_ready()
     return app
@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until", "derived")
+
+    def __init__(self, value, expires_at, stale_until):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.derived = {}
+
+
+class _Load:
+    # Per-key load lock, dropped once no thread is loading or waiting on the key
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class TTLCache:
+    """
+    Thread-safe TTL + LRU cache for model reads.
+
+    Concurrent misses on the same key share a single load. If a load fails
+    (pool exhausted, MySQL down) and an expired value is still inside its stale
+    window, that value is served instead of the error; such loads run inside
+    `stale_load_context()` (e.g. to fail fast instead of queueing for a
+    database connection). A load that returns
+    None (no such row) is not cached, so rows added outside the app show up
+    on the next read.
+    """
+
+    def __init__(self, ttl=300, max_entries=1024, stale_ttl=86400):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.version = 0
+        self._entries = OrderedDict()
+        self._load_locks = {}
+        self.stale_load_context = nullcontext
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.stale_hits = 0
+
+    def configure(
+        self, ttl=None, max_entries=None, stale_ttl=None, stale_load_context=None
+    ):
+        if ttl is not None:
+            self.ttl = ttl
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if stale_ttl is not None:
+            self.stale_ttl = stale_ttl
+        if stale_load_context is not None:
+            self.stale_load_context = stale_load_context
+
+    def _fresh(self, key, now):
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            self._entries.move_to_end(key)
+            return entry
+        return None
+
+    def get(self, key, loader):
+        if self.ttl <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._fresh(key, now)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+            load = self._load_locks.get(key)
+            if load is None:
+                load = self._load_locks[key] = _Load()
+            load.users += 1
+
+        try:
+            with load.lock:
+                return self._load(key, loader)
+        finally:
+            with self._lock:
+                load.users -= 1
+                if load.users == 0 and self._load_locks.get(key) is load:
+                    del self._load_locks[key]
+
+    def _load(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            entry = self._fresh(key, now)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            stale = self._entries.get(key)
+            version = self.version
+
+        if stale is not None and stale.stale_until <= now:
+            stale = None
+        try:
+            with self.stale_load_context() if stale is not None else nullcontext():
+                value = loader()
+        except Exception:
+            if stale is not None:
+                self.stale_hits += 1
+                return stale.value
+            raise
+
+        with self._lock:
+            # Don't store a value read before a concurrent invalidation
+            if value is None:
+                self._entries.pop(key, None)
+            elif self.version == version:
+                self._entries[key] = _Entry(
+                    value, now + self.ttl, now + self.ttl + self.stale_ttl
+                )
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def holds(self, key, value):
+        """
+        True if `value` is the entry cached under `key`, i.e. what get_derived
+        builds for it will be memoized rather than rebuilt on every call.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.value is value
+
+    def get_derived(self, key, value, name, builder):
+        """
+        Memoize builder(value) (e.g. a serialized response body) on the cache
+        entry holding `value`, so it is rebuilt only when that entry is replaced.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.value is not value:
+                entry = None
+            elif name in entry.derived:
+                return entry.derived[name]
+
+        derived = builder(value)
+        if entry is not None:
+            with self._lock:
+                entry.derived[name] = derived
+        return derived
+
+    def invalidate(self, *keys, drop=False):
+        """
+        Expire the given keys. Expired values are kept only as a stale-if-error
+        fallback and are never served while the database is reachable; pass
+        drop=True when they must not be served at all (e.g. a deleted row).
+        """
+        with self._lock:
+            self.version += 1
+            for key in keys:
+                if drop:
+                    self._entries.pop(key, None)
+                    continue
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.expires_at = 0
+
+    def invalidate_where(self, match, drop=False):
+        """
+        Expire (or with drop=True remove) every key for which match(key) is true.
+        """
+        with self._lock:
+            self.version += 1
+            for key in [key for key in self._entries if match(key)]:
+                if drop:
+                    del self._entries[key]
+                else:
+                    self._entries[key].expires_at = 0
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+            }
+
+
+# Door catalog reads (GET /doors, GET /doors/<id>)
+catalog_cache = TTLCache()
@@ -0,0 +1,204 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from .metrics import EMAIL_SEND_SECONDS, EMAIL_SEND_FAILURES
+from .models import (
+    get_newsletter_campaign,
+    get_resumable_campaign_ids,
+    claim_newsletter_campaign,
+    checkpoint_newsletter_campaign,
+    finish_newsletter_campaign,
+    get_subscribers_after,
+)
+
+
+class _Throttle:
+    """
+    Spaces out Resend API calls across all sender threads so the campaign stays
+    under the account's requests-per-second limit. A 429 pushes every thread back.
+    """
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def back_off(self, seconds):
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+def _is_rate_limited(error):
+    return str(getattr(error, "code", "")) == "429"
+
+
+def _send_batch(params, idempotency_key, throttle, max_retries):
+    """
+    Submit one Resend batch. Returns (sent, error).
+    """
+    import resend
+
+    for attempt in range(max_retries + 1):
+        throttle.wait()
+        start = time.perf_counter()
+        try:
+            # Resend drops a repeated idempotency key, so a batch resent after a
+            # crash between send and checkpoint is not delivered twice
+            resend.Batch.send(params, {"idempotency_key": idempotency_key})
+            EMAIL_SEND_SECONDS.observe(time.perf_counter() - start, "campaign_batch")
+            return len(params), None
+        except Exception as e:
+            EMAIL_SEND_SECONDS.observe(time.perf_counter() - start, "campaign_batch")
+            EMAIL_SEND_FAILURES.inc("campaign_batch")
+            if attempt < max_retries and _is_rate_limited(e):
+                throttle.back_off(2**attempt)
+                continue
+            return 0, str(e)
+
+
+def run_campaign(campaign_id):
+    """
+    Send a campaign to everyone who subscribed before it was created,
+    resuming from its last checkpoint.
+    A batch that still fails after its retries stops the run and leaves the
+    campaign pending at the checkpoint before it.
+    Returns False if the campaign is missing, finished or owned by another runner.
+    """
+    # Email modules load on first send, not at app import (see FAST_START)
+    import resend
+
+    from .email import build_newsletter_params
+
+    config = current_app.config
+    lease_seconds = config["CAMPAIGN_LEASE_SECONDS"]
+    batch_size = config["CAMPAIGN_BATCH_SIZE"]
+    concurrency = config["CAMPAIGN_CONCURRENCY"]
+    max_retries = config["CAMPAIGN_MAX_RETRIES"]
+
+    if not claim_newsletter_campaign(campaign_id, lease_seconds):
+        return False
+    campaign = get_newsletter_campaign(campaign_id)
+
+    resend.api_key = config["RESEND_API_KEY"]
+    verified_domain = config["RESEND_VERIFIED_DOMAIN"]
+    throttle = _Throttle(config["CAMPAIGN_REQUESTS_PER_SECOND"])
+
+    # Each page holds one batch per sender thread. Progress is checkpointed
+    # through the last batch before the first failure, and a failure ends the
+    # run as pending, so a resume retries every unsent recipient
+    after_id = campaign["last_subscriber_id"]
+    error = None
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while error is None:
+                subscribers = get_subscribers_after(
+                    after_id, batch_size * concurrency, campaign["created_at"]
+                )
+                if not subscribers:
+                    break
+
+                chunks = [
+                    subscribers[i : i + batch_size]
+                    for i in range(0, len(subscribers), batch_size)
+                ]
+                futures = []
+                for chunk in chunks:
+                    params = [
+                        build_newsletter_params(
+                            verified_domain,
+                            campaign["subject"],
+                            campaign["content"],
+                            subscriber["email"],
+                        )
+                        for subscriber in chunk
+                    ]
+                    # The recipients are fixed when the campaign is created and
+                    # every run chunks them from a batch boundary, so a resent
+                    # batch has the same recipients and the same key
+                    key = f"campaign-{campaign_id}-{chunk[0]['id']}-{chunk[-1]['id']}"
+                    futures.append(
+                        pool.submit(_send_batch, params, key, throttle, max_retries)
+                    )
+
+                # Batches after a failed one may have gone out too; a resume
+                # sends them again under the same keys and Resend drops them
+                sent = failed = 0
+                for chunk, future in zip(chunks, futures):
+                    batch_sent, batch_error = future.result()
+                    if error is not None:
+                        continue
+                    if batch_error:
+                        failed = len(chunk)
+                        error = batch_error
+                    else:
+                        sent += batch_sent
+                        after_id = chunk[-1]["id"]
+
+                checkpoint_newsletter_campaign(
+                    campaign_id, after_id, sent, failed, lease_seconds, error
+                )
+
+        if error:
+            current_app.logger.error(
+                f"Campaign {campaign_id}: batch failed, left pending: {error}"
+            )
+            finish_newsletter_campaign(campaign_id, "pending", error)
+        else:
+            finish_newsletter_campaign(campaign_id, "completed")
+        return True
+    except Exception as e:
+        # Leave the campaign resumable from its last checkpoint
+        current_app.logger.error(f"Campaign {campaign_id} stopped: {str(e)}")
+        finish_newsletter_campaign(campaign_id, "pending", str(e))
+        raise
+
+
+def start_campaign_in_background(app, campaign_id):
+    def run():
+        with app.app_context():
+            try:
+                run_campaign(campaign_id)
+            except Exception:
+                pass  # already logged and checkpointed by run_campaign
+
+    thread = threading.Thread(target=run, name=f"campaign-{campaign_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+campaigns_cli = AppGroup("campaigns", help="Newsletter campaign commands.")
+
+
+@campaigns_cli.command("run")
+@click.argument("campaign_id")
+def run_command(campaign_id):
+    """Send (or resume) a single campaign."""
+    if run_campaign(campaign_id):
+        campaign = get_newsletter_campaign(campaign_id)
+        click.echo(
+            f"Campaign {campaign_id} {campaign['status']}: sent "
+            f"{campaign['sent_count']}, failed {campaign['failed_count']}."
+        )
+    else:
+        click.echo(f"Campaign {campaign_id} is finished, missing or already running.")
+
+
+@campaigns_cli.command("resume")
+def resume_command():
+    """Resume every pending campaign and any whose runner has died."""
+    for campaign_id in get_resumable_campaign_ids():
+        click.echo(f"Resuming campaign {campaign_id}...")
+        run_command.callback(campaign_id)
@@ -0,0 +1,75 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+_COMPRESSIBLE = ("application/json", "text/")
+
+
+def choose_encoding(size):
+    """
+    Content-Encoding to use for a body of `size` bytes given the request's
+    Accept-Encoding: "br" when brotli is installed and accepted, else "gzip",
+    or None (too small, not accepted, or compression disabled).
+    """
+    config = current_app.config
+    if not config["COMPRESSION_ENABLED"] or size < config["COMPRESSION_MIN_SIZE"]:
+        return None
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"] > 0:
+        return "br"
+    if accepted["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def compress_body(body, encoding, cached=False):
+    """
+    Compress `body` (bytes). Bodies that are compressed once and cached use
+    the maximum level; per-request compression uses the configured levels.
+    """
+    config = current_app.config
+    if encoding == "br":
+        quality = 11 if cached else config["COMPRESSION_BROTLI_QUALITY"]
+        return brotli.compress(body, quality=quality)
+    level = 9 if cached else config["COMPRESSION_GZIP_LEVEL"]
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _compress_response(response):
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not (response.mimetype or "").startswith(_COMPRESSIBLE)
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    encoding = choose_encoding(len(body))
+    if encoding is None:
+        return response
+
+    response.set_data(compress_body(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    # A strong ETag identifies one representation
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_compression(app):
+    """
+    Compress JSON and text responses per Accept-Encoding. Responses that
+    already carry a Content-Encoding (e.g. pre-compressed catalog bodies) and
+    streamed responses are left alone.
+    """
+    app.after_request(_compress_response)
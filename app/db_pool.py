@@ -0,0 +1,315 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from mysql.connector.errors import PoolError
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+# Callables run after every cursor execute()/executemany() on a pooled
+# connection as observer(operation, params, seconds, caller, cursor)
+QUERY_OBSERVERS = []
+
+# Shared query-building helpers; their queries are attributed to whoever called them
+QUERY_HELPERS = set()
+
+# Connections inherited from a parent process. They are kept referenced and
+# never closed in the child: closing (or garbage collecting) one shuts down a
+# socket the parent still owns
+INHERITED_CONNECTIONS = []
+
+
+class PoolTimeoutError(PoolError):
+    pass
+
+
+class TimedCursor:
+    """
+    Cursor proxy that times execute()/executemany() and reports each statement,
+    with the name of the function that ran it, to QUERY_OBSERVERS.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+    def execute(self, operation, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, *args, **kwargs)
+        finally:
+            self._report(operation, args[0] if args else kwargs.get("params"), start)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._report(operation, seq_params, start)
+
+    def _report(self, operation, params, start):
+        seconds = time.perf_counter() - start
+        # _report <- execute <- caller
+        frame = sys._getframe(2)
+        while frame.f_back is not None and frame.f_code.co_name in QUERY_HELPERS:
+            frame = frame.f_back
+        caller = frame.f_code.co_name
+        for observer in QUERY_OBSERVERS:
+            try:
+                observer(operation, params, seconds, caller, self._cursor)
+            except Exception:
+                pass
+
+
+class _Slot:
+    __slots__ = ("cnx", "created_at", "last_used", "pid")
+
+    def __init__(self, cnx, now):
+        self.cnx = cnx
+        self.created_at = now
+        self.last_used = now
+        self.pid = os.getpid()
+
+
+class PooledConnection:
+    """
+    Handed out by BoundedConnectionPool. Behaves like the underlying MySQL
+    connection; close() returns it to the pool instead of disconnecting.
+    """
+
+    def __init__(self, pool, slot):
+        self._pool = pool
+        self._slot = slot
+
+    def __getattr__(self, name):
+        if self._slot is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(self._slot.cnx, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self.__getattr__("cursor")(*args, **kwargs)
+        return TimedCursor(cursor) if QUERY_OBSERVERS else cursor
+
+    def close(self):
+        slot, self._slot = self._slot, None
+        if slot is not None:
+            self._pool._release(slot)
+
+
+class BoundedConnectionPool:
+    """
+    Thread-safe MySQL connection pool.
+
+    - Up to `pool_size` connections are kept open; bursts may open another
+      `max_overflow`, which are closed again when returned.
+    - When every connection is busy, get_connection() waits up to `timeout`
+      seconds for one to come back before raising PoolTimeoutError.
+    - Connections older than `max_age` seconds are replaced, and connections
+      idle for more than `ping_after` seconds are pinged before reuse.
+    """
+
+    def __init__(
+        self,
+        connect,
+        pool_size=5,
+        max_overflow=5,
+        timeout=10.0,
+        max_age=3600,
+        ping_after=30,
+    ):
+        self._connect = connect
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_age = max_age
+        self.ping_after = ping_after
+        self._reset()
+
+    def _reset(self):
+        self._idle = deque()
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._stale = 0
+        self._wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_total_ms = 0.0
+
+    def get_connection(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._cond:
+            slot = None
+            while True:
+                if self._idle:
+                    # LIFO keeps the most recently used (least likely stale) ones hot
+                    slot = self._idle.pop()
+                    break
+                if self._total < self.pool_size + self.max_overflow:
+                    # Reserve a place; the connection is opened outside the lock
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {timeout}s waiting for a database connection"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+            self._checkouts += 1
+            self._record_wait((time.monotonic() - start) * 1000)
+
+        try:
+            slot = self._prepare(slot)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, slot)
+
+    def _record_wait(self, wait_ms):
+        # Called with the lock held
+        self._wait_total_ms += wait_ms
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                self._wait_buckets[i] += 1
+                return
+        self._wait_buckets[-1] += 1
+
+    def _prepare(self, slot):
+        now = time.monotonic()
+        if slot is not None and now - slot.created_at > self.max_age:
+            self._discard(slot)
+            slot = None
+            with self._cond:
+                self._recycled += 1
+        elif slot is not None and now - slot.last_used > self.ping_after:
+            # Only connections that sat idle long enough to be dropped by the
+            # server (wait_timeout, proxies) pay for a round trip
+            try:
+                slot.cnx.ping(reconnect=False)
+            except Exception:
+                self._discard(slot)
+                slot = None
+                with self._cond:
+                    self._stale += 1
+
+        if slot is None:
+            slot = _Slot(self._connect(), time.monotonic())
+            with self._cond:
+                self._created += 1
+        return slot
+
+    def _discard(self, slot):
+        try:
+            slot.cnx.close()
+        except Exception:
+            pass
+
+    def _release(self, slot):
+        if slot.pid != os.getpid():
+            # Checked out before a fork; it belongs to the parent's pool
+            INHERITED_CONNECTIONS.append(slot.cnx)
+            return
+        keep = True
+        try:
+            if slot.cnx.unread_result:
+                # A cursor was abandoned part way through an unbuffered result;
+                # the connection cannot run anything until the rest is read
+                keep = False
+            elif slot.cnx.in_transaction:
+                slot.cnx.rollback()
+        except Exception:
+            keep = False
+
+        with self._cond:
+            self._in_use -= 1
+            # Overflow connections stay open while someone is waiting for one
+            if keep and (self._total <= self.pool_size or self._waiting):
+                slot.last_used = time.monotonic()
+                self._idle.append(slot)
+            else:
+                # Surplus or broken connection: close it and free the place
+                self._total -= 1
+                keep = False
+            self._cond.notify()
+
+        if not keep:
+            self._discard(slot)
+
+    def open_unpooled(self):
+        """
+        Open a connection outside the pool (not counted, not instrumented),
+        e.g. for diagnostics that must not compete with requests for a slot.
+        """
+        return self._connect()
+
+    def close_idle(self):
+        with self._cond:
+            slots = list(self._idle)
+            self._idle.clear()
+            self._total -= len(slots)
+            self._cond.notify_all()
+        for slot in slots:
+            self._discard(slot)
+
+    def reset_after_fork(self):
+        """
+        Forget every connection inherited from the parent process. Call in a
+        forked child before it uses the pool; connections reopen on demand.
+        """
+        INHERITED_CONNECTIONS.extend(slot.cnx for slot in self._idle)
+        self._reset()
+
+    def stats(self):
+        with self._cond:
+            buckets = {}
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS_MS, self._wait_buckets):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self._wait_buckets[-1]
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "open": self._total,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "stale": self._stale,
+                "wait_ms_total": round(self._wait_total_ms, 3),
+                "wait_ms_buckets": buckets,
+            }
@@ -0,0 +1,56 @@
+import os
+import re
+
+from jinja2 import Environment, FileSystemLoader
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates", "email")
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_WHITESPACE_RE = re.compile(r"\s+")
+_BETWEEN_TAGS_RE = re.compile(r">\s+<")
+
+
+def minify_html(source):
+    """
+    Strip HTML comments and collapse the indentation whitespace in a template.
+    Runs on the template source, so it costs nothing at render time.
+    """
+    source = _COMMENT_RE.sub("", source)
+    source = _WHITESPACE_RE.sub(" ", source)
+    source = _BETWEEN_TAGS_RE.sub("><", source)
+    return source.strip()
+
+
+class MinifyingLoader(FileSystemLoader):
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        return minify_html(source), filename, uptodate
+
+
+# One environment per process: templates are compiled on first use and then
+# served from the environment's cache. Templates ship with the code, so there
+# is no need to stat the files for changes on every render.
+_env = Environment(
+    loader=MinifyingLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+)
+
+
+def get_email_template_names():
+    # Files starting with "_" are partials/macros, not sendable emails
+    return [
+        name
+        for name in _env.list_templates(extensions=["html"])
+        if not name.startswith("_") and not name.endswith("layout.html")
+    ]
+
+
+def precompile_email_templates():
+    for name in _env.list_templates(extensions=["html"]):
+        _env.get_template(name)
+
+
+def render_email_template(name, **context):
+    return _env.get_template(name).render(**context)
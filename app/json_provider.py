@@ -0,0 +1,102 @@
+import decimal
+from datetime import date, datetime, timezone
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; Flask's provider is used without it
+    orjson = None
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+
+
+def _http_date(value):
+    """
+    werkzeug.http.http_date (naive values are UTC) without the email.utils
+    round trip; listings format one per row.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        clock = f"{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+    else:
+        clock = "00:00:00"
+    return (
+        f"{_DAYS[value.weekday()]}, {value.day:02d} {_MONTHS[value.month - 1]} "
+        f"{value.year:04d} {clock} GMT"
+    )
+
+
+def _default(o):
+    # Same representations as Flask's provider for what orjson leaves to us
+    if isinstance(o, date):
+        return _http_date(o)
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    # Datetimes go through _default so they keep Flask's HTTP date format
+    _OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson (Rust), for routes that return thousands of
+    row dicts. Output matches Flask's provider: sorted keys, Decimal as a
+    string, datetimes as HTTP dates, UUIDs as strings, compact unless in debug.
+    Non-ASCII text is written as UTF-8 rather than \\u escapes.
+
+    Calls with json.dumps-only arguments (indent, cls, ...) and values orjson
+    cannot encode (e.g. integers over 64 bits) fall back to Flask's provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=_default, option=_OPTIONS).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(
+                obj, default=_default, option=_OPTIONS | orjson.OPT_APPEND_NEWLINE
+            )
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """
+    Install the JSON provider named by JSON_PROVIDER ("orjson" or "default").
+    orjson is optional; without it the app keeps Flask's provider.
+    """
+    if app.config["JSON_PROVIDER"] == "orjson":
+        if orjson is None:
+            app.logger.warning("JSON_PROVIDER=orjson but orjson is not installed")
+            return
+        app.json = OrjsonProvider(app)
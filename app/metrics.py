@@ -0,0 +1,468 @@
+import atexit
+import fcntl
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+from .db_pool import QUERY_OBSERVERS, WAIT_BUCKETS_MS
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+EMAIL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Every metric defined in this process, in exposition order
+REGISTRY = []
+
+# Callables returning extra samples (e.g. pool statistics) at collection time
+COLLECTORS = []
+
+_metrics_dir = None
+_flush_interval = None
+
+
+class _Metric:
+    """
+    Base for counters and histograms.
+
+    Each thread updates its own shard, so recording a value never takes a lock
+    and only allocates the first time a thread sees a label combination.
+    Shards are summed when the metrics are collected.
+    """
+
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._reset()
+        REGISTRY.append(self)
+
+    def _reset(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), values))
+            return values
+
+    def _merge(self, target, key, values):
+        current = target.get(key)
+        if current is None:
+            target[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                current[i] += value
+
+    def collect(self):
+        """
+        Return {label_values: values} summed over every thread. Shards of
+        finished threads are folded into a retired total and dropped.
+        """
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    for key, values in list(shard.items()):
+                        self._merge(self._retired, key, values)
+            self._shards = live
+
+            totals = {key: list(values) for key, values in self._retired.items()}
+            for _, shard in live:
+                for key, values in list(shard.items()):
+                    self._merge(totals, key, values)
+        return totals
+
+    def snapshot(self):
+        return {
+            "type": self.type,
+            "help": self.help,
+            "labels": list(self.labels),
+            "buckets": list(getattr(self, "buckets", ())),
+            "samples": [[list(key), values] for key, values in self.collect().items()],
+        }
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *label_values, amount=1):
+        shard = self._shard()
+        values = shard.get(label_values)
+        if values is None:
+            values = shard[label_values] = [0]
+        values[0] += amount
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=REQUEST_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *label_values):
+        shard = self._shard()
+        values = shard.get(label_values)
+        if values is None:
+            # One slot per bucket, one for +Inf, then the running sum
+            values = shard[label_values] = [0] * (len(self.buckets) + 2)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to build a response, by endpoint, method and status.",
+    ("endpoint", "method", "status"),
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "MySQL statement execution time, by calling model function.",
+    ("function",),
+    QUERY_BUCKETS,
+)
+EMAIL_SEND_SECONDS = Histogram(
+    "email_send_duration_seconds",
+    "Time spent sending through Resend, by email function.",
+    ("function",),
+    EMAIL_BUCKETS,
+)
+EMAIL_SEND_FAILURES = Counter(
+    "email_send_failures_total",
+    "Failed Resend sends, by email function.",
+    ("function",),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter, by endpoint.",
+    ("endpoint",),
+)
+
+
+def timed_email(func):
+    """
+    Record send latency for an email function, and a failure whenever it
+    returns False or raises.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = func(*args, **kwargs)
+            ok = result is not False
+            return result
+        finally:
+            EMAIL_SEND_SECONDS.observe(time.perf_counter() - start, name)
+            if not ok:
+                EMAIL_SEND_FAILURES.inc(name)
+
+    return wrapper
+
+
+def record_rate_limit_breach(request_limit):
+    # Flask-Limiter on_breach callback; returning None keeps the default 429
+    RATE_LIMIT_REJECTIONS.inc(request.endpoint or "unknown")
+
+
+def _observe_query(operation, params, seconds, caller, cursor):
+    DB_QUERY_SECONDS.observe(seconds, caller)
+
+
+def _collect_pool():
+    from .models import get_db_pool_stats
+
+    stats = get_db_pool_stats()
+    if stats is None:
+        return {}
+
+    buckets = [ms / 1000 for ms in WAIT_BUCKETS_MS]
+    cumulative = list(stats["wait_ms_buckets"].values())
+    counts = [cumulative[0]] + [b - a for a, b in zip(cumulative, cumulative[1:])]
+    return {
+        "db_pool_checkout_wait_seconds": {
+            "type": "histogram",
+            "help": "Time spent waiting for a pooled MySQL connection.",
+            "labels": [],
+            "buckets": buckets,
+            "samples": [[[], counts + [stats["wait_ms_total"] / 1000]]],
+        },
+        "db_pool_timeouts_total": {
+            "type": "counter",
+            "help": "Checkouts that gave up waiting for a connection.",
+            "labels": [],
+            "buckets": [],
+            "samples": [[[], [stats["timeouts"]]]],
+        },
+        "db_pool_connections": {
+            "type": "gauge",
+            "help": "Pooled MySQL connections, by state.",
+            "labels": ["state"],
+            "buckets": [],
+            "samples": [
+                [[state], [stats[state]]]
+                for state in ("open", "in_use", "idle", "waiting")
+            ],
+        },
+    }
+
+
+def snapshot():
+    metrics = {metric.name: metric.snapshot() for metric in REGISTRY}
+    for collector in COLLECTORS:
+        try:
+            metrics.update(collector())
+        except Exception:
+            pass
+    return metrics
+
+
+# Counters and histograms of exited workers, folded together
+_RETIRED_SNAPSHOT = "metrics-retired.json"
+
+
+def _snapshot_path(pid):
+    return os.path.join(_metrics_dir, f"metrics-{pid}.json")
+
+
+def write_snapshot():
+    """
+    Publish this worker's metrics to METRICS_DIR so that whichever worker
+    serves /metrics can include them.
+    """
+    if not _metrics_dir:
+        return
+    path = _snapshot_path(os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"pid": os.getpid(), "metrics": snapshot()}, f)
+    os.replace(tmp_path, path)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge_into(merged, metrics):
+    for name, metric in metrics.items():
+        target = merged.setdefault(name, dict(metric, samples={}))
+        for labels, values in metric["samples"]:
+            key = tuple(labels)
+            current = target["samples"].get(key)
+            if current is None:
+                target["samples"][key] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    current[i] += value
+
+
+def _retire(dead, retired):
+    """
+    Fold exited workers' metrics into metrics-retired.json and delete their
+    snapshots, so METRICS_DIR doesn't grow as gunicorn recycles workers.
+    Returns the new retired metrics.
+    """
+    merged = {}
+    _merge_into(merged, retired)
+    for _, metrics in dead:
+        _merge_into(merged, metrics)
+    retired = {
+        name: dict(metric, samples=[[list(k), v] for k, v in metric["samples"].items()])
+        for name, metric in merged.items()
+    }
+    path = os.path.join(_metrics_dir, _RETIRED_SNAPSHOT)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"pid": None, "metrics": retired}, f)
+    os.replace(f"{path}.tmp", path)
+    for snapshot_path, _ in dead:
+        os.remove(snapshot_path)
+    return retired
+
+
+def _worker_snapshots():
+    yield os.getpid(), snapshot()
+    if not _metrics_dir:
+        return
+    # Held while scanning so two workers serving /metrics never retire the
+    # same exited worker twice or read it from both places
+    with open(os.path.join(_metrics_dir, "metrics.lock"), "w") as lock:
+        fcntl.lockf(lock, fcntl.LOCK_EX)
+        retired_path = os.path.join(_metrics_dir, _RETIRED_SNAPSHOT)
+        dead = []
+        for path in glob.glob(os.path.join(_metrics_dir, "metrics-*.json")):
+            if path == retired_path:
+                continue
+            data = _read_snapshot(path)
+            if data is None or data["pid"] == os.getpid():
+                continue
+            if _pid_alive(data["pid"]):
+                yield data["pid"], data["metrics"]
+                continue
+            # Counters and histograms of exited workers still count toward the
+            # totals; their gauges describe connections that no longer exist
+            metrics = {
+                name: metric
+                for name, metric in data["metrics"].items()
+                if metric["type"] != "gauge"
+            }
+            dead.append((path, metrics))
+
+        retired = (_read_snapshot(retired_path) or {"metrics": {}})["metrics"]
+        if dead:
+            try:
+                retired = _retire(dead, retired)
+            except OSError:
+                # Still counted; retiring them is retried on the next scrape
+                for _, metrics in dead:
+                    yield None, metrics
+        yield None, retired
+
+
+def _merge_snapshots():
+    merged = {}
+    for _, metrics in _worker_snapshots():
+        _merge_into(merged, metrics)
+    return merged
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """
+    All workers' metrics in the Prometheus text exposition format.
+    """
+    lines = []
+    for name, metric in _merge_snapshots().items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labels"]
+        for labels, values in sorted(metric["samples"].items()):
+            label_str = _format_labels(names, labels)
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{label_str} {_format_number(values[0])}")
+                continue
+            cumulative = 0
+            bounds = [_format_number(b) for b in metric["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, values[:-1]):
+                cumulative += count
+                le = _format_labels(names, labels, f'le="{bound}"')
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            lines.append(f"{name}_sum{label_str} {_format_number(values[-1])}")
+            lines.append(f"{name}_count{label_str} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _start_request_timer():
+    g.metrics_start = time.perf_counter()
+
+
+def _record_request(response):
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            request.endpoint or "unmatched",
+            request.method,
+            str(response.status_code),
+        )
+    return response
+
+
+def _flush_loop(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_snapshot()
+        except Exception:
+            pass
+
+
+def _start_flush_thread():
+    threading.Thread(
+        target=_flush_loop, args=(_flush_interval,), name="metrics-flush", daemon=True
+    ).start()
+
+
+def _reset_after_fork():
+    # A forked worker starts from zero (the parent's values are the parent's
+    # to report) and needs its own flush thread; threads do not survive fork
+    for metric in REGISTRY:
+        metric._reset()
+    if _metrics_dir is not None:
+        _start_flush_thread()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def init_metrics(app):
+    """
+    Hook request timing and query timing into the app. Call before the rate
+    limiter is initialised so rejected requests are timed too.
+    """
+    global _metrics_dir, _flush_interval
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    app.before_request(_start_request_timer)
+    app.after_request(_record_request)
+    if _observe_query not in QUERY_OBSERVERS:
+        QUERY_OBSERVERS.append(_observe_query)
+    if _collect_pool not in COLLECTORS:
+        COLLECTORS.append(_collect_pool)
+
+    # With several gunicorn workers, each one publishes its metrics to a shared
+    # directory every METRICS_FLUSH_INTERVAL seconds
+    if app.config["METRICS_DIR"] and _metrics_dir is None:
+        _metrics_dir = app.config["METRICS_DIR"]
+        _flush_interval = app.config["METRICS_FLUSH_INTERVAL"]
+        os.makedirs(_metrics_dir, exist_ok=True)
+        _start_flush_thread()
+        atexit.register(write_snapshot)
@@ -0,0 +1,287 @@
+import hashlib
+import os
+import re
+import sys
+import uuid
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from mysql.connector import errorcode
+from mysql.connector.errors import DatabaseError
+
+from .db_pool import QUERY_OBSERVERS
+from . import models
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+# Re-running DDL against a database that already has the object is not an error:
+# tables/indexes created by hand before migrations existed are adopted as-is
+_ALREADY_APPLIED_ERRORS = {
+    errorcode.ER_TABLE_EXISTS_ERROR,
+    errorcode.ER_DUP_FIELDNAME,
+    errorcode.ER_DUP_KEYNAME,
+}
+
+
+def get_migrations():
+    """
+    Return [(version, name, sql)] for every NNNN_name.sql file, in order.
+    """
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.match(r"^(\d+)_(\w+)\.sql$", filename)
+        if not match:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+            migrations.append((int(match.group(1)), match.group(2), f.read()))
+    return migrations
+
+
+def _checksum(sql):
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+
+def _statements(sql):
+    # Drop comment lines, then split on semicolons ending a line
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [
+        statement.strip()
+        for statement in re.split(r";\s*$", "\n".join(lines), flags=re.MULTILINE)
+        if statement.strip()
+    ]
+
+
+def _ensure_migrations_table(cursor):
+    cursor.execute(
+        """CREATE TABLE IF NOT EXISTS schema_migrations (
+               version INT NOT NULL PRIMARY KEY,
+               name VARCHAR(255) NOT NULL,
+               checksum CHAR(64) NOT NULL,
+               applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+           )"""
+    )
+
+
+def get_applied_migrations():
+    with models.get_db_cursor() as cursor:
+        _ensure_migrations_table(cursor)
+        cursor.execute(
+            "SELECT version, name, checksum, applied_at FROM schema_migrations"
+        )
+        return {row["version"]: row for row in cursor.fetchall()}
+
+
+def upgrade(target=None, echo=None):
+    """
+    Apply pending migrations up to `target` (default: all).
+    MySQL commits DDL implicitly, so a migration is recorded only after all
+    of its statements succeed and every statement must be safe to re-run.
+    Returns the versions applied.
+    """
+    applied = get_applied_migrations()
+    done = []
+    for version, name, sql in get_migrations():
+        if version in applied or (target is not None and version > target):
+            continue
+        if echo:
+            echo(f"Applying {version:04d}_{name}...")
+        with models.get_db_cursor() as cursor:
+            for statement in _statements(sql):
+                try:
+                    cursor.execute(statement)
+                except DatabaseError as e:
+                    if e.errno not in _ALREADY_APPLIED_ERRORS:
+                        raise
+            cursor.execute(
+                """INSERT INTO schema_migrations (version, name, checksum)
+                   VALUES (%s, %s, %s)""",
+                (version, name, _checksum(sql)),
+            )
+        done.append(version)
+    return done
+
+
+def migration_status():
+    """
+    Return [(version, name, state)] where state is "applied", "pending" or
+    "changed" (the file was edited after it was applied).
+    """
+    applied = get_applied_migrations()
+    status = []
+    for version, name, sql in get_migrations():
+        row = applied.get(version)
+        if row is None:
+            state = "pending"
+        elif row["checksum"] != _checksum(sql):
+            state = "changed"
+        else:
+            state = "applied"
+        status.append((version, name, state))
+    return status
+
+
+# Index check
+# Runs the queries in app/models.py against the live database, records each
+# statement through the pooled-cursor observer hook and EXPLAINs it. Writes
+# (outbox claims) run inside a transaction that is rolled back afterwards.
+
+# Sample values for the listing filters. Every filter in models.*_FILTERS is
+# checked on its own, so a new filter is covered without editing this list
+_FILTER_SAMPLES = {
+    "confirmed": 1,
+    "resolved": "no",
+    "from": datetime(2000, 1, 1),
+    "to": datetime(2100, 1, 1),
+    "q": "mensah",
+}
+
+# Rollup tables behind GET /stats are read whole by design: they hold one row
+# per day, door type or enquiry state, not one per order
+_EXPECTED_SCANS = set(models.STATS_TABLES)
+
+
+def _sample_id(table):
+    with models.get_db_cursor() as cursor:
+        cursor.execute(f"SELECT id FROM {table} LIMIT 1")
+        row = cursor.fetchone()
+    # Any id works for EXPLAIN when the table is still empty
+    return row["id"] if row else str(uuid.uuid4())
+
+
+def _index_check_calls():
+    door_id = _sample_id("doors")
+    order_id = _sample_id("orders")
+    property_id = _sample_id("property_enquiry")
+    contact_id = _sample_id("contact_enquiry")
+    subscriber_id = _sample_id("subscribers")
+    campaign_id = _sample_id("newsletter_campaigns")
+    page_cursor = models.encode_page_cursor(datetime(2100, 1, 1), "~")
+
+    calls = [
+        lambda: models._fetch_all_doors(),
+        lambda: models._fetch_door(door_id),
+        lambda: models.get_doors_by_ids([door_id]),
+        lambda: models.get_order_by_id(order_id),
+        # The first batch is enough to capture the export query
+        lambda: next(models.iter_orders_with_items(), None),
+        lambda: models.get_property_enquiry_by_id(property_id),
+        lambda: models.get_contact_enquiry_by_id(contact_id),
+        lambda: models.get_subscribers_after(None, 100),
+        lambda: models.get_subscribers_after(subscriber_id, 100),
+        lambda: models.get_subscribers_after(
+            subscriber_id, 100, datetime(2100, 1, 1)
+        ),
+        lambda: models.get_newsletter_campaign(campaign_id),
+        lambda: models.get_resumable_campaign_ids(),
+        lambda: models.claim_outbox_emails(20, 60),
+        lambda: models.get_dashboard_stats(),
+    ]
+    for get_page, filters in [
+        (models.get_orders_page, models.ORDER_FILTERS),
+        (models.get_property_enquiries_page, models.PROPERTY_ENQUIRY_FILTERS),
+        (models.get_contact_enquiries_page, models.CONTACT_ENQUIRY_FILTERS),
+    ]:
+        calls.append(lambda get_page=get_page: get_page(50))
+        calls.append(lambda get_page=get_page: get_page(50, page_cursor))
+        for name in filters:
+            sample = {name: _FILTER_SAMPLES.get(name, "a@example.com")}
+            calls.append(
+                lambda get_page=get_page, sample=sample: get_page(50, filters=sample)
+            )
+    return calls
+
+
+def check_indexes():
+    """
+    EXPLAIN every captured query. Returns [(caller, sql, plan_row, problem)]
+    where problem is "missing index" (a full scan with no usable index),
+    "full scan" (the optimizer chose a scan over an available index, usually
+    because the table is still small) or None. Whole reads of the GET /stats
+    rollup tables are expected and not reported.
+    """
+    captured = []
+
+    def capture(operation, params, seconds, caller, cursor):
+        captured.append((caller, operation, params))
+
+    results = []
+    seen = set()
+    # Everything runs on the request's connection inside one transaction that
+    # is rolled back, so the outbox claim changes nothing
+    with current_app.test_request_context():
+        with models.get_db_connection() as conn:
+            conn.start_transaction()
+            try:
+                calls = _index_check_calls()
+                QUERY_OBSERVERS.append(capture)
+                try:
+                    for call in calls:
+                        call()
+                finally:
+                    QUERY_OBSERVERS.remove(capture)
+
+                with models.get_db_cursor() as cursor:
+                    for caller, operation, params in captured:
+                        sql = " ".join(operation.split())
+                        if (caller, sql) in seen:
+                            continue
+                        seen.add((caller, sql))
+                        cursor.execute(f"EXPLAIN {operation}", params)
+                        for row in cursor.fetchall():
+                            problem = None
+                            if (
+                                row.get("type") == "ALL"
+                                and row.get("table") not in _EXPECTED_SCANS
+                            ):
+                                problem = (
+                                    "full scan"
+                                    if row.get("possible_keys")
+                                    else "missing index"
+                                )
+                            results.append((caller, sql, row, problem))
+            finally:
+                conn.rollback()
+    return results
+
+
+db_cli = AppGroup("db", help="Database schema commands.")
+
+
+@db_cli.command("upgrade")
+@click.option("--to", "target", type=int, default=None, help="Stop at this version.")
+def upgrade_command(target):
+    """Apply pending schema migrations."""
+    applied = upgrade(target, echo=click.echo)
+    click.echo(f"Applied {len(applied)} migration(s).")
+
+
+@db_cli.command("status")
+def status_command():
+    """List migrations and whether they have been applied."""
+    for version, name, state in migration_status():
+        click.echo(f"{version:04d}_{name}: {state}")
+
+
+@db_cli.command("check-indexes")
+def check_indexes_command():
+    """EXPLAIN the model queries and fail if any needs a missing index."""
+    missing = 0
+    for caller, sql, row, problem in check_indexes():
+        status = problem or f"ok ({row.get('type')}, key={row.get('key')})"
+        click.echo(f"{caller} [{row.get('table')}]: {status}")
+        if problem:
+            click.echo(f"    {sql}")
+        if problem == "missing index":
+            missing += 1
+    if missing:
+        click.echo(f"{missing} query step(s) have no usable index.")
+        sys.exit(1)
+
+
+@db_cli.command("rebuild-stats")
+def rebuild_stats_command():
+    """Recompute the GET /stats rollup tables from the source tables."""
+    models.rebuild_stats()
+    click.echo(f"Rebuilt {', '.join(models.STATS_TABLES)}.")
@@ -0,0 +1,75 @@
+-- Core tables used by app/models.py and app/routes.py. Existing databases
+-- already have them, so every statement is IF NOT EXISTS; their indexes
+-- are added by later migrations.
+CREATE TABLE IF NOT EXISTS doors (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description TEXT NULL,
+    price DECIMAL(10, 2) NOT NULL,
+    image_url VARCHAR(1024) NULL,
+    type VARCHAR(64) NOT NULL,
+    stock INT NOT NULL DEFAULT 0,
+    is_deleted TINYINT(1) NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS door_images (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    door_id CHAR(36) NOT NULL,
+    image_url VARCHAR(1024) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    customer_name VARCHAR(255) NOT NULL,
+    phone_number VARCHAR(64) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    location VARCHAR(512) NOT NULL,
+    notes TEXT NULL,
+    total_price DECIMAL(12, 2) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    is_confirmed TINYINT(1) NOT NULL DEFAULT 0,
+    is_deleted TINYINT(1) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS order_items (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    order_id CHAR(36) NOT NULL,
+    door_id CHAR(36) NOT NULL,
+    quantity INT NOT NULL,
+    unit_price DECIMAL(10, 2) NOT NULL,
+    orientation VARCHAR(64) NULL,
+    door_type VARCHAR(64) NULL
+);
+
+CREATE TABLE IF NOT EXISTS property_enquiry (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    first_name VARCHAR(255) NOT NULL,
+    last_name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    phone VARCHAR(64) NOT NULL,
+    selected_property VARCHAR(255) NOT NULL,
+    message TEXT NULL,
+    resolved ENUM('yes', 'no') NOT NULL DEFAULT 'no',
+    submitted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS contact_enquiry (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    first_name VARCHAR(255) NOT NULL,
+    last_name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    phone VARCHAR(64) NOT NULL,
+    enquiry_type VARCHAR(255) NOT NULL,
+    additional_info TEXT NULL,
+    resolved ENUM('yes', 'no') NOT NULL DEFAULT 'no',
+    submitted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- add_newsletter_subscriber relies on the unique email to reject duplicates
+CREATE TABLE IF NOT EXISTS subscribers (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL,
+    subscribed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_subscribers_email (email)
+);
@@ -0,0 +1,14 @@
+-- Transactional email outbox, written alongside orders/enquiries/subscribers
+-- and drained by app/outbox.py
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    kind VARCHAR(64) NOT NULL,
+    payload JSON NOT NULL,
+    status ENUM('pending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME NULL,
+    KEY idx_email_outbox_due (status, next_attempt_at)
+);
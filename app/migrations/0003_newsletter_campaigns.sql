@@ -0,0 +1,17 @@
+-- Newsletter campaigns sent by app/campaigns.py. last_subscriber_id is the
+-- keyset checkpoint into subscribers (ordered by id) so a crashed send resumes.
+CREATE TABLE IF NOT EXISTS newsletter_campaigns (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    subject VARCHAR(255) NOT NULL,
+    content MEDIUMTEXT NOT NULL,
+    status ENUM('pending', 'running', 'completed', 'failed') NOT NULL DEFAULT 'pending',
+    last_subscriber_id CHAR(36) NULL,
+    sent_count INT NOT NULL DEFAULT 0,
+    failed_count INT NOT NULL DEFAULT 0,
+    last_error TEXT NULL,
+    locked_until DATETIME NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    completed_at DATETIME NULL,
+    KEY idx_newsletter_campaigns_status (status, locked_until)
+);
@@ -0,0 +1,5 @@
+-- Composite indexes backing the newest-first keyset pagination of the admin
+-- listings: ORDER BY <timestamp> DESC, id DESC with a (timestamp, id) cursor.
+CREATE INDEX idx_orders_listing ON orders (is_deleted, created_at, id);
+CREATE INDEX idx_property_enquiry_listing ON property_enquiry (submitted_at, id);
+CREATE INDEX idx_contact_enquiry_listing ON contact_enquiry (submitted_at, id);
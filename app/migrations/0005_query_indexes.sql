@@ -0,0 +1,14 @@
+-- Indexes for the remaining lookups in app/models.py, so none of them scans
+-- a whole table as it grows. Checked by `flask db check-indexes`.
+
+-- _fetch_all_doors: WHERE is_deleted = 0 ORDER BY created_at DESC
+CREATE INDEX idx_doors_listing ON doors (is_deleted, created_at);
+
+-- _fetch_door, get_doors_by_ids, update_door: images by door
+CREATE INDEX idx_door_images_door ON door_images (door_id);
+
+-- get_order_by_id: items by order (JOIN to doors is on its primary key)
+CREATE INDEX idx_order_items_order ON order_items (order_id);
+
+-- Joins and lookups from a door to the orders containing it
+CREATE INDEX idx_order_items_door ON order_items (door_id);
@@ -0,0 +1,32 @@
+-- Indexes behind the filters on the admin listings (GET /orders, /property,
+-- /contact). Equality filters lead, then the keyset (timestamp, id) columns
+-- so a filtered page is still one range scan in listing order.
+
+-- GET /orders?confirmed=
+CREATE INDEX idx_orders_confirmed ON orders (is_deleted, is_confirmed, created_at, id);
+
+-- GET /orders?email= / ?phone=
+CREATE INDEX idx_orders_email ON orders (email);
+CREATE INDEX idx_orders_phone ON orders (phone_number);
+
+-- GET /orders?q= (customer name, email, phone)
+CREATE FULLTEXT INDEX ft_orders_customer ON orders (customer_name, email, phone_number);
+
+-- GET /property?resolved= / ?selected_property=
+CREATE INDEX idx_property_enquiry_resolved ON property_enquiry (resolved, submitted_at, id);
+CREATE INDEX idx_property_enquiry_property
+    ON property_enquiry (selected_property, submitted_at, id);
+CREATE INDEX idx_property_enquiry_email ON property_enquiry (email);
+
+-- GET /property?q= (name, email, message)
+CREATE FULLTEXT INDEX ft_property_enquiry_search
+    ON property_enquiry (first_name, last_name, email, message);
+
+-- GET /contact?resolved= / ?enquiry_type=
+CREATE INDEX idx_contact_enquiry_resolved ON contact_enquiry (resolved, submitted_at, id);
+CREATE INDEX idx_contact_enquiry_type ON contact_enquiry (enquiry_type, submitted_at, id);
+CREATE INDEX idx_contact_enquiry_email ON contact_enquiry (email);
+
+-- GET /contact?q= (name, email, message)
+CREATE FULLTEXT INDEX ft_contact_enquiry_search
+    ON contact_enquiry (first_name, last_name, email, additional_info);
@@ -0,0 +1,34 @@
+-- Rollup tables behind GET /stats. app/models.py keeps them current in the
+-- same transaction as each write; run `flask db rebuild-stats` once after
+-- applying this migration (and whenever they need repairing) to fill them
+-- from the source tables.
+
+-- Live (not deleted) orders by day of created_at
+CREATE TABLE IF NOT EXISTS order_daily_stats (
+    day DATE NOT NULL PRIMARY KEY,
+    orders INT NOT NULL DEFAULT 0,
+    confirmed_orders INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    confirmed_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0
+);
+
+-- Items on live orders by door type
+CREATE TABLE IF NOT EXISTS door_type_sales (
+    door_type VARCHAR(64) NOT NULL PRIMARY KEY,
+    quantity INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0
+);
+
+-- Property and contact enquiries by resolved state
+CREATE TABLE IF NOT EXISTS enquiry_stats (
+    kind VARCHAR(16) NOT NULL,
+    resolved ENUM('yes', 'no') NOT NULL,
+    enquiries INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, resolved)
+);
+
+-- New subscribers by day of subscribed_at
+CREATE TABLE IF NOT EXISTS subscriber_daily_stats (
+    day DATE NOT NULL PRIMARY KEY,
+    subscribers INT NOT NULL DEFAULT 0
+);
@@ -1,37 +1,133 @@
-from flask import current_app
-import mysql.connector.pooling
+from flask import current_app, g, has_request_context
+import mysql.connector
+from mysql.connector import errorcode
+import base64
+import json
+import os
+import re
+import threading
 import uuid
 from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from .cache import catalog_cache
+from .db_pool import BoundedConnectionPool, QUERY_HELPERS
 
 # Connection pool setup
+# Created by create_app(), or on first DB access when FAST_START is set
 db_pool = None
+_db_pool_lock = threading.Lock()
 
 
-def init_db_pool():
+def init_db_pool(connect=None):
     global db_pool
-    if db_pool is None:
-        db_pool = mysql.connector.pooling.MySQLConnectionPool(
-            pool_name="door_app_pool",
-            pool_size=5,
-            host=current_app.config["MYSQL_HOST"],
-            user=current_app.config["MYSQL_USER"],
-            password=current_app.config["MYSQL_PASSWORD"],
-            database=current_app.config["MYSQL_DB"],
-            autocommit=True,
+    if db_pool is not None:
+        return
+    with _db_pool_lock:
+        if db_pool is not None:
+            return
+        config = current_app.config
+        db_config = {
+            "host": config["MYSQL_HOST"],
+            "user": config["MYSQL_USER"],
+            "password": config["MYSQL_PASSWORD"],
+            "database": config["MYSQL_DB"],
+            "autocommit": True,
+            # CURRENT_TIMESTAMP defaults and NOW() then agree with _utc_now()
+            "time_zone": "+00:00",
+        }
+        db_pool = BoundedConnectionPool(
+            connect or (lambda: mysql.connector.connect(**db_config)),
+            pool_size=config["DB_POOL_SIZE"],
+            max_overflow=config["DB_POOL_MAX_OVERFLOW"],
+            timeout=config["DB_POOL_TIMEOUT"],
+            max_age=config["DB_POOL_MAX_AGE"],
+            ping_after=config["DB_POOL_PING_IDLE_SECONDS"],
         )
 
 
+def _close_idle_before_fork():
+    # A preloaded parent hands its children no open connections
+    if db_pool is not None:
+        db_pool.close_idle()
+
+
+def _reset_pool_after_fork():
+    global _db_pool_lock
+    _db_pool_lock = threading.Lock()
+    if db_pool is not None:
+        db_pool.reset_after_fork()
+
+
+# Forked workers (gunicorn --preload) must never share the parent's sockets
+os.register_at_fork(
+    before=_close_idle_before_fork, after_in_child=_reset_pool_after_fork
+)
+
+
+def get_db_pool_stats():
+    if db_pool is None:
+        return None
+    return db_pool.stats()
+
+
+# Per-thread override of the pool checkout timeout, see checkout_timeout()
+_checkout = threading.local()
+
+
 @contextmanager
-def get_db_connection():
+def checkout_timeout(seconds):
+    """
+    Make pool checkouts on this thread give up after `seconds` instead of
+    DB_POOL_TIMEOUT, for callers with a fallback (e.g. a stale cached copy).
+    """
+    previous = getattr(_checkout, "timeout", None)
+    _checkout.timeout = seconds
+    try:
+        yield
+    finally:
+        _checkout.timeout = previous
+
+
+def _checkout_connection():
     if db_pool is None:
         init_db_pool()
-    conn = db_pool.get_connection()
+    return db_pool.get_connection(getattr(_checkout, "timeout", None))
+
+
+@contextmanager
+def get_db_connection(request_scoped=True):
+    """
+    Yield a pooled connection.
+    Inside a request, every model call shares one connection that is checked
+    out on first use and returned by release_request_connection at teardown,
+    so a route never holds more than one pool slot. Pass request_scoped=False
+    for a private connection (e.g. a long-running streaming cursor).
+    """
+    if request_scoped and has_request_context():
+        conn = g.get("db_conn")
+        if conn is None:
+            conn = g.db_conn = _checkout_connection()
+        yield conn
+        return
+
+    conn = _checkout_connection()
     try:
         yield conn
     finally:
         conn.close()
 
 
+def release_request_connection(exception=None):
+    conn = g.pop("db_conn", None)
+    if conn is not None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            conn.close()
+
+
 @contextmanager
 def get_db_cursor(dictionary=True):
     with get_db_connection() as conn:
@@ -42,157 +138,460 @@ def get_db_cursor(dictionary=True):
             cursor.close()
 
 
-def get_all_doors():
+# Keyset pagination
+# Listings are ordered newest first on (timestamp, id). A page cursor is the
+# (timestamp, id) of the last row returned, so every page is an index range
+# scan of `limit` rows no matter how deep into the table it is.
+def encode_page_cursor(timestamp, row_id):
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+# Sparse fieldsets
+# Read endpoints accept ?fields= naming a subset of a resource's whitelisted
+# fields; only those columns are selected, and related rows (door images,
+# order items) are only queried when asked for.
+def _select_list(fields, required=()):
+    # Names come from the whitelists below, never straight from the request
+    return ", ".join(dict.fromkeys((*required, *fields)))
+
+
+def _project(row, fields):
+    """
+    Drop columns that were selected only for bookkeeping (ids, keyset columns).
+    """
+    for key in list(row):
+        if key not in fields:
+            del row[key]
+    return row
+
+
+# List filters
+# Each listing maps filter names to a parameterized condition; values are
+# parsed by the route and bound, never interpolated. Migration 0006 indexes
+# every condition together with the listing's keyset columns.
+ORDER_FILTERS = {
+    "confirmed": "is_confirmed = %s",
+    "email": "email = %s",
+    "phone": "phone_number = %s",
+    "from": "created_at >= %s",
+    "to": "created_at < %s",
+    "q": "MATCH (customer_name, email, phone_number) AGAINST (%s IN BOOLEAN MODE)",
+}
+PROPERTY_ENQUIRY_FILTERS = {
+    "resolved": "resolved = %s",
+    "selected_property": "selected_property = %s",
+    "email": "email = %s",
+    "from": "submitted_at >= %s",
+    "to": "submitted_at < %s",
+    "q": "MATCH (first_name, last_name, email, message) AGAINST (%s IN BOOLEAN MODE)",
+}
+CONTACT_ENQUIRY_FILTERS = {
+    "resolved": "resolved = %s",
+    "enquiry_type": "enquiry_type = %s",
+    "email": "email = %s",
+    "from": "submitted_at >= %s",
+    "to": "submitted_at < %s",
+    "q": (
+        "MATCH (first_name, last_name, email, additional_info) "
+        "AGAINST (%s IN BOOLEAN MODE)"
+    ),
+}
+
+# InnoDB does not index words shorter than innodb_ft_min_token_size (3)
+FULLTEXT_MIN_WORD = 3
+
+
+def fulltext_query(text):
+    """
+    Turn free text into a BOOLEAN MODE query that requires every word as a
+    prefix ("ama mens" -> "+ama* +mens*"). Operators in the input are dropped.
+    """
+    words = [w for w in re.findall(r"\w+", text) if len(w) >= FULLTEXT_MIN_WORD]
+    if not words:
+        raise ValueError(
+            f"q needs at least one word of {FULLTEXT_MIN_WORD} or more characters"
+        )
+    return " ".join(f"+{word}*" for word in words[:10])
+
+
+def _filter_where(conditions, filters):
+    where, params = [], []
+    for name, value in (filters or {}).items():
+        if name == "q":
+            value = fulltext_query(value)
+        where.append(conditions[name])
+        params.append(value)
+    return where, params
+
+
+def _keyset_select(
+    columns, table, order_column, where, params, limit, cursor, fields=None
+):
+    """
+    Run a newest-first listing query, optionally as one keyset page.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    With `fields`, only those columns (plus the keyset columns for a page)
+    are read.
+    """
+    if fields is not None:
+        # A page cursor is built from the last row's keyset columns
+        required = ("id", order_column) if limit is not None else ()
+        columns = _select_list(fields, required)
+    where = list(where)
+    params = list(params)
+    if cursor:
+        timestamp, row_id = decode_page_cursor(cursor)
+        where.append(f"({order_column} < %s OR ({order_column} = %s AND id < %s))")
+        params += [timestamp, timestamp, row_id]
+
+    query = f"SELECT {columns} FROM {table}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += f" ORDER BY {order_column} DESC, id DESC"
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        query += " LIMIT %s"
+        params.append(limit + 1)
+
+    with get_db_cursor() as db_cursor:
+        db_cursor.execute(query, params)
+        rows = db_cursor.fetchall()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_page_cursor(rows[-1][order_column], rows[-1]["id"])
+    if fields is not None:
+        rows = [_project(row, fields) for row in rows]
+    return rows, next_cursor
+
+
+# Listing queries are reported under get_orders_page etc., not the shared helper
+QUERY_HELPERS.add("_keyset_select")
+
+
+@contextmanager
+def get_db_transaction():
+    """
+    Yield a dictionary cursor inside an explicit transaction.
+    The pool runs with autocommit, so statements that must succeed or fail
+    together (e.g. a row and its outbox email) go through here.
+    """
+    with get_db_connection() as conn:
+        # Join a transaction already open on the request connection
+        outermost = not conn.in_transaction
+        if outermost:
+            conn.start_transaction()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            yield cursor
+            if outermost:
+                conn.commit()
+        except Exception:
+            if outermost:
+                conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+DOOR_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "image_url",
+    "type",
+    "stock",
+    "created_at",
+    "sub_images",
+)
+# The listing has no sub images
+DOOR_LIST_FIELDS = DOOR_FIELDS[:-1]
+
+
+# Catalog cache keys: ("doors", fields) and ("door", door_id, fields), where
+# fields is None for the full representation
+def get_all_doors(fields=None):
+    return catalog_cache.get(("doors", fields), lambda: _fetch_all_doors(fields))
+
+
+def _fetch_all_doors(fields=None):
+    columns = "id, name, price, type, image_url"
+    if fields is not None:
+        columns = _select_list(fields)
     with get_db_cursor() as cursor:
         cursor.execute(
-            "SELECT id, name, price, type, image_url FROM doors WHERE is_deleted = 0 ORDER BY created_at DESC"
+            f"SELECT {columns} FROM doors WHERE is_deleted = 0 ORDER BY created_at DESC"
         )
         return cursor.fetchall()
 
 
-def get_door_by_id(door_id):
+def get_door_by_id(door_id, fields=None):
+    return catalog_cache.get(
+        ("door", door_id, fields), lambda: _fetch_door(door_id, fields)
+    )
+
+
+def _fetch_door(door_id, fields=None):
+    columns = "*"
+    if fields is not None:
+        columns = _select_list([f for f in fields if f != "sub_images"], ("id",))
     with get_db_cursor() as cursor:
         cursor.execute(
-            "SELECT * FROM doors WHERE id = %s AND is_deleted = 0", (door_id,)
+            f"SELECT {columns} FROM doors WHERE id = %s AND is_deleted = 0", (door_id,)
         )
         door = cursor.fetchone()
 
-        if door:
+        if door and (fields is None or "sub_images" in fields):
             cursor.execute(
                 "SELECT image_url FROM door_images WHERE door_id = %s", (door_id,)
             )
             door["sub_images"] = [img["image_url"] for img in cursor.fetchall()]
+        if door and fields is not None:
+            _project(door, fields)
         return door
 
 
+def invalidate_door_cache(door_id=None, drop=False):
+    """
+    Expire cached catalog reads (every fieldset) after a door is created,
+    updated or deleted. Deletes pass drop=True so the door is not served
+    even as a stale-if-error fallback.
+    """
+    catalog_cache.invalidate_where(
+        lambda key: key[0] == "doors" or key[:2] == ("door", door_id), drop=drop
+    )
+
+
 def delete_door(door_id):
     with get_db_cursor() as cursor:
         cursor.execute("UPDATE doors SET is_deleted = 1 WHERE id = %s", (door_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+    invalidate_door_cache(door_id, drop=True)
+    return deleted
 
 
 def update_door(door_id, update_data):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            # Update main door fields
-            set_clauses = []
-            values = []
-            allowed_fields = [
-                "name",
-                "description",
-                "price",
-                "type",
-                "stock",
-                "image_url",
-            ]
-
-            for field in allowed_fields:
-                if field in update_data:
-                    set_clauses.append(f"{field} = %s")
-                    values.append(update_data[field])
-
-            if set_clauses:
-                query = f"UPDATE doors SET {', '.join(set_clauses)} WHERE id = %s AND is_deleted = 0"
-                cursor.execute(query, values + [door_id])
-
-            # Handle sub images
-            if "sub_images_operations" in update_data:
-                ops = update_data["sub_images_operations"]
-
-                if "delete" in ops:
-                    for url in ops["delete"]:
-                        cursor.execute(
-                            "DELETE FROM door_images WHERE door_id = %s AND image_url = %s",
-                            (door_id, url),
-                        )
-
-                if "add" in ops:
-                    for url in ops["add"]:
-                        cursor.execute(
-                            "INSERT INTO door_images (id, door_id, image_url) VALUES (%s, %s, %s)",
-                            (str(uuid.uuid4()), door_id, url),
-                        )
+    with get_db_transaction() as cursor:
+        # Update main door fields
+        set_clauses = []
+        values = []
+        allowed_fields = [
+            "name",
+            "description",
+            "price",
+            "type",
+            "stock",
+            "image_url",
+        ]
+
+        for field in allowed_fields:
+            if field in update_data:
+                set_clauses.append(f"{field} = %s")
+                values.append(update_data[field])
+
+        if set_clauses:
+            query = f"UPDATE doors SET {', '.join(set_clauses)} WHERE id = %s AND is_deleted = 0"
+            cursor.execute(query, values + [door_id])
+
+        # Handle sub images
+        if "sub_images_operations" in update_data:
+            ops = update_data["sub_images_operations"]
+
+            if "delete" in ops:
+                for url in ops["delete"]:
+                    cursor.execute(
+                        "DELETE FROM door_images WHERE door_id = %s AND image_url = %s",
+                        (door_id, url),
+                    )
 
-            conn.commit()
-            return True
+            if "add" in ops:
+                for url in ops["add"]:
+                    cursor.execute(
+                        "INSERT INTO door_images (id, door_id, image_url) VALUES (%s, %s, %s)",
+                        (str(uuid.uuid4()), door_id, url),
+                    )
 
+    invalidate_door_cache(door_id)
+    return True
 
-def create_order(order_data):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            # First validate all door items and calculate total price
-            total_price = 0
-            order_items = []
-
-            for item in order_data["items"]:
-                cursor.execute(
-                    "SELECT price, type FROM doors WHERE id = %s AND is_deleted = 0",
-                    (item["door_id"],),
-                )
-                door = cursor.fetchone()
 
-                if not door:
-                    raise ValueError(
-                        f"Door with ID {item['door_id']} not found or deleted"
-                    )
+def get_doors_by_ids(door_ids):
+    """
+    Fetch several doors, with their sub images, in two queries total.
+    Returns a dict keyed by door id; missing or deleted doors are left out.
+    """
+    door_ids = list(dict.fromkeys(door_ids))
+    if not door_ids:
+        return {}
 
-                unit_price = door["price"]
-                door_type = door["type"]
-                total_price += unit_price * item["quantity"]
-                order_items.append(
-                    {
-                        "door_id": item["door_id"],
-                        "quantity": item["quantity"],
-                        "unit_price": unit_price,
-                        "orientation": item.get("orientation", "left"),
-                        "door_type": door_type,
-                    }
-                )
+    with get_db_cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(door_ids))
+        cursor.execute(
+            f"SELECT * FROM doors WHERE id IN ({placeholders}) AND is_deleted = 0",
+            door_ids,
+        )
+        doors = {door["id"]: door for door in cursor.fetchall()}
+        for door in doors.values():
+            door["sub_images"] = []
 
-            # Create the order
-            order_id = str(uuid.uuid4())
+        if doors:
+            placeholders = ", ".join(["%s"] * len(doors))
             cursor.execute(
-                """INSERT INTO orders 
-                (id, customer_name, phone_number, email, location, notes, total_price) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (
-                    order_id,
-                    order_data["name"],
-                    order_data["phone"],
-                    order_data["email"],
-                    order_data["address"],
-                    order_data.get("notes", ""),
-                    total_price,
-                ),
+                f"SELECT door_id, image_url FROM door_images WHERE door_id IN ({placeholders})",
+                list(doors),
             )
+            for img in cursor.fetchall():
+                doors[img["door_id"]]["sub_images"].append(img["image_url"])
+        return doors
+
+
+def price_order_items(items, doors):
+    """
+    Price cart items against looked-up doors (keyed by id).
+    Returns (order_items, total_price); raises ValueError for an unknown door.
+    """
+    total_price = 0
+    order_items = []
+
+    for item in items:
+        door = doors.get(item["door_id"])
+
+        if not door:
+            raise ValueError(f"Door with ID {item['door_id']} not found or deleted")
+
+        unit_price = door["price"]
+        door_type = door["type"]
+        total_price += unit_price * item["quantity"]
+        order_items.append(
+            {
+                "door_id": item["door_id"],
+                "quantity": item["quantity"],
+                "unit_price": unit_price,
+                "orientation": item.get("orientation", "left"),
+                "door_type": door_type,
+                "door_name": door.get("name"),
+            }
+        )
+    return order_items, total_price
 
-            # Create order items
-            for item in order_items:
-                cursor.execute(
-                    """INSERT INTO order_items 
-                    (id, order_id, door_id, quantity, unit_price, orientation, door_type) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                    (
-                        str(uuid.uuid4()),
-                        order_id,
-                        item["door_id"],
-                        item["quantity"],
-                        item["unit_price"],
-                        item["orientation"],
-                        item["door_type"],
-                    ),
+
+def _utc_now():
+    """
+    The value a CURRENT_TIMESTAMP column default would store: connections run
+    with a UTC session time zone and DATETIME keeps whole seconds.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def create_order(order_data):
+    """
+    Create an order with its items and queue the confirmation emails.
+    Returns the order in the same shape as get_order_by_id.
+    """
+    with get_db_transaction() as cursor:
+        # Look up every door in the cart with one query
+        door_ids = list(dict.fromkeys(item["door_id"] for item in order_data["items"]))
+        placeholders = ", ".join(["%s"] * len(door_ids))
+        cursor.execute(
+            f"SELECT id, name, price, type FROM doors WHERE id IN ({placeholders}) AND is_deleted = 0",
+            door_ids,
+        )
+        doors = {door["id"]: door for door in cursor.fetchall()}
+
+        order_items, total_price = price_order_items(order_data["items"], doors)
+
+        # Create the order. Server-side defaults are resolved here so the
+        # returned order matches the stored row without reading it back.
+        order = {
+            "id": str(uuid.uuid4()),
+            "customer_name": order_data["name"],
+            "phone_number": order_data["phone"],
+            "email": order_data["email"],
+            "location": order_data["address"],
+            "notes": order_data.get("notes", ""),
+            "total_price": total_price,
+            "created_at": _utc_now(),
+            "is_confirmed": 0,
+            "items": order_items,
+        }
+        order_id = order["id"]
+        cursor.execute(
+            """INSERT INTO orders 
+            (id, customer_name, phone_number, email, location, notes, total_price, created_at) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+            (
+                order_id,
+                order["customer_name"],
+                order["phone_number"],
+                order["email"],
+                order["location"],
+                order["notes"],
+                total_price,
+                order["created_at"],
+            ),
+        )
+
+        # Create order items; executemany sends them as one multi-row INSERT
+        cursor.executemany(
+            """INSERT INTO order_items 
+            (id, order_id, door_id, quantity, unit_price, orientation, door_type) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            [
+                (
+                    str(uuid.uuid4()),
+                    order_id,
+                    item["door_id"],
+                    item["quantity"],
+                    item["unit_price"],
+                    item["orientation"],
+                    item["door_type"],
                 )
+                for item in order_items
+            ],
+        )
 
-            conn.commit()
-            return order_id
+        _enqueue_email(cursor, "order_confirmation", {"order": order})
+        _bump_order_stats(cursor, order["created_at"], orders=1, revenue=total_price)
+        _bump_door_type_sales(cursor, order_items)
+        return order
 
 
 # Update get_order_by_id and get_all_orders to include email
-def get_order_by_id(order_id):
+ORDER_FIELDS = (
+    "id",
+    "customer_name",
+    "phone_number",
+    "email",
+    "location",
+    "notes",
+    "total_price",
+    "created_at",
+    "is_confirmed",
+    "items",
+)
+ORDER_LIST_FIELDS = ORDER_FIELDS[:-1]
+
+
+def get_order_by_id(order_id, fields=None):
+    columns = """id, customer_name, phone_number, email, location, notes, 
+                  total_price, created_at, is_confirmed"""
+    if fields is not None:
+        columns = _select_list([f for f in fields if f != "items"], ("id",))
     with get_db_cursor() as cursor:
         cursor.execute(
-            """SELECT id, customer_name, phone_number, email, location, notes, 
-                  total_price, created_at, is_confirmed 
+            f"""SELECT {columns} 
                FROM orders 
                WHERE id = %s AND is_deleted = 0""",
             (order_id,),
@@ -201,6 +600,10 @@ def get_order_by_id(order_id):
 
         if not order:
             return None
+        if fields is not None:
+            _project(order, fields)
+            if "items" not in fields:
+                return order
 
         # Get order items
         cursor.execute(
@@ -215,205 +618,754 @@ def get_order_by_id(order_id):
         return order
 
 
-def get_all_orders():
-    with get_db_cursor() as cursor:
-        cursor.execute(
-            """SELECT id, customer_name, phone_number, email, location, 
-                  total_price, created_at, is_confirmed 
-               FROM orders 
-               WHERE is_deleted = 0 
-               ORDER BY created_at DESC"""
-        )
-        return cursor.fetchall()
+ORDER_LIST_COLUMNS = """id, customer_name, phone_number, email, location,
+    total_price, created_at, is_confirmed"""
+
+
+def get_all_orders(fields=None, filters=None):
+    return get_orders_page(limit=None, fields=fields, filters=filters)[0]
+
+
+def get_orders_page(limit, cursor=None, fields=None, filters=None):
+    where, params = _filter_where(ORDER_FILTERS, filters)
+    return _keyset_select(
+        ORDER_LIST_COLUMNS,
+        "orders",
+        "created_at",
+        ["is_deleted = 0"] + where,
+        params,
+        limit,
+        cursor,
+        fields,
+    )
+
+
+ORDER_EXPORT_FIELDS = [
+    "id",
+    "customer_name",
+    "phone_number",
+    "email",
+    "location",
+    "notes",
+    "total_price",
+    "created_at",
+    "is_confirmed",
+]
+ORDER_EXPORT_ITEM_FIELDS = [
+    "door_id",
+    "door_name",
+    "door_type",
+    "quantity",
+    "unit_price",
+    "orientation",
+]
+
+
+def iter_orders_with_items(batch_size=500):
+    """
+    Yield every order with its items, oldest first.
+    Rows are read through an unbuffered cursor in batches of `batch_size`, so
+    memory stays flat however many orders are exported.
+    """
+    with get_db_connection(request_scoped=False) as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(
+                """SELECT o.id, o.customer_name, o.phone_number, o.email, o.location,
+                      o.notes, o.total_price, o.created_at, o.is_confirmed,
+                      oi.door_id, d.name AS door_name, oi.door_type, oi.quantity,
+                      oi.unit_price, oi.orientation
+                   FROM orders o
+                   LEFT JOIN order_items oi ON oi.order_id = o.id
+                   LEFT JOIN doors d ON d.id = oi.door_id
+                   WHERE o.is_deleted = 0
+                   ORDER BY o.created_at, o.id"""
+            )
+
+            # The join returns one row per item; fold consecutive rows back into orders
+            order = None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    if order is None or order["id"] != row["id"]:
+                        if order is not None:
+                            yield order
+                        order = {field: row[field] for field in ORDER_EXPORT_FIELDS}
+                        order["items"] = []
+                    if row["door_id"] is not None:
+                        order["items"].append(
+                            {field: row[field] for field in ORDER_EXPORT_ITEM_FIELDS}
+                        )
+            if order is not None:
+                yield order
+        finally:
+            # Closing an unbuffered cursor with rows left (the client went
+            # away mid-export) raises instead of discarding them. Rather than
+            # stream the rest of the result for nothing, leave it unread; the
+            # pool drops a connection returned with an unread result
+            if not conn.unread_result:
+                cursor.close()
 
 
 # Mark an order as completed
 def mark_order_as_completed(order_id):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(
-                "UPDATE orders SET is_confirmed = 1 WHERE id = %s AND is_deleted = 0",
-                (order_id,),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+    with get_db_transaction() as cursor:
+        cursor.execute(
+            """UPDATE orders SET is_confirmed = 1
+               WHERE id = %s AND is_deleted = 0 AND is_confirmed = 0""",
+            (order_id,),
+        )
+        if cursor.rowcount == 0:
+            return False
+        # The UPDATE holds the row lock, so this reads the row it changed
+        cursor.execute(
+            "SELECT created_at, total_price FROM orders WHERE id = %s", (order_id,)
+        )
+        order = cursor.fetchone()
+        _bump_order_stats(
+            cursor,
+            order["created_at"],
+            confirmed_orders=1,
+            confirmed_revenue=order["total_price"],
+        )
+        return True
 
 
 # Delete (soft-delete) an order
 def delete_order(order_id):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(
-                "UPDATE orders SET is_deleted = 1 WHERE id = %s AND is_deleted = 0",
-                (order_id,),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+    with get_db_transaction() as cursor:
+        cursor.execute(
+            "UPDATE orders SET is_deleted = 1 WHERE id = %s AND is_deleted = 0",
+            (order_id,),
+        )
+        if cursor.rowcount == 0:
+            return False
+        cursor.execute(
+            "SELECT created_at, total_price, is_confirmed FROM orders WHERE id = %s",
+            (order_id,),
+        )
+        order = cursor.fetchone()
+        confirmed = 1 if order["is_confirmed"] else 0
+        _bump_order_stats(
+            cursor,
+            order["created_at"],
+            orders=-1,
+            confirmed_orders=-confirmed,
+            revenue=-order["total_price"],
+            confirmed_revenue=-order["total_price"] * confirmed,
+        )
+        cursor.execute(
+            "SELECT door_type, quantity, unit_price FROM order_items WHERE order_id = %s",
+            (order_id,),
+        )
+        _bump_door_type_sales(cursor, cursor.fetchall(), sign=-1)
+        return True
 
 
 def create_property_enquiry(enquiry_data):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            enquiry_id = str(uuid.uuid4())
-            cursor.execute(
-                """INSERT INTO property_enquiry 
-                (id, first_name, last_name, email, phone, selected_property, message) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (
-                    enquiry_id,
-                    enquiry_data["first_name"],
-                    enquiry_data["last_name"],
-                    enquiry_data["email"],
-                    enquiry_data["phone"],
-                    enquiry_data["selected_property"],
-                    enquiry_data.get("message", ""),
-                ),
-            )
-            conn.commit()
-            return enquiry_id
+    """
+    Create an enquiry and queue its emails. Returns the stored enquiry.
+    """
+    enquiry = {
+        "id": str(uuid.uuid4()),
+        "first_name": enquiry_data["first_name"],
+        "last_name": enquiry_data["last_name"],
+        "email": enquiry_data["email"],
+        "phone": enquiry_data["phone"],
+        "selected_property": enquiry_data["selected_property"],
+        "message": enquiry_data.get("message", ""),
+        "resolved": "no",
+        "submitted_at": _utc_now(),
+    }
+    with get_db_transaction() as cursor:
+        cursor.execute(
+            """INSERT INTO property_enquiry 
+            (id, first_name, last_name, email, phone, selected_property, message, submitted_at) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+            (
+                enquiry["id"],
+                enquiry["first_name"],
+                enquiry["last_name"],
+                enquiry["email"],
+                enquiry["phone"],
+                enquiry["selected_property"],
+                enquiry["message"],
+                enquiry["submitted_at"],
+            ),
+        )
+        _enqueue_email(cursor, "property_enquiry", {"enquiry": enquiry})
+        _bump_enquiry_stats(cursor, "property", "no", 1)
+    return enquiry
+
+
+PROPERTY_ENQUIRY_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "selected_property",
+    "message",
+    "resolved",
+    "submitted_at",
+)
+PROPERTY_ENQUIRY_COLUMNS = """id, first_name, last_name, email, phone,
+    selected_property, message, resolved, submitted_at"""
+
+
+def get_all_property_enquiries(fields=None, filters=None):
+    return get_property_enquiries_page(limit=None, fields=fields, filters=filters)[0]
+
+
+def get_property_enquiries_page(limit, cursor=None, fields=None, filters=None):
+    where, params = _filter_where(PROPERTY_ENQUIRY_FILTERS, filters)
+    return _keyset_select(
+        PROPERTY_ENQUIRY_COLUMNS,
+        "property_enquiry",
+        "submitted_at",
+        where,
+        params,
+        limit,
+        cursor,
+        fields,
+    )
+
+
+def get_property_enquiry_by_id(enquiry_id, fields=None):
+    columns = PROPERTY_ENQUIRY_COLUMNS
+    if fields is not None:
+        columns = _select_list(fields)
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            f"SELECT {columns} FROM property_enquiry WHERE id = %s", (enquiry_id,)
+        )
+        return cursor.fetchone()
+
+
+def mark_enquiry_as_resolved(enquiry_id):
+    return _set_enquiry_resolved("property", enquiry_id, "yes")
+
+
+def mark_enquiry_as_unresolved(enquiry_id):
+    return _set_enquiry_resolved("property", enquiry_id, "no")
+
+
+def delete_property_enquiry(enquiry_id):
+    return _delete_enquiry("property", enquiry_id)
 
 
-def get_all_property_enquiries():
+def create_contact_enquiry(enquiry_data):
+    """
+    Create an enquiry and queue its emails. Returns the stored enquiry.
+    """
+    enquiry = {
+        "id": str(uuid.uuid4()),
+        "first_name": enquiry_data["first_name"],
+        "last_name": enquiry_data["last_name"],
+        "email": enquiry_data["email"],
+        "phone": enquiry_data["phone"],
+        "enquiry_type": enquiry_data["enquiry_type"],
+        "additional_info": enquiry_data.get("additional_info", ""),
+        "resolved": "no",
+        "submitted_at": _utc_now(),
+    }
+    with get_db_transaction() as cursor:
+        cursor.execute(
+            """INSERT INTO contact_enquiry 
+            (id, first_name, last_name, email, phone, enquiry_type, additional_info, submitted_at) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+            (
+                enquiry["id"],
+                enquiry["first_name"],
+                enquiry["last_name"],
+                enquiry["email"],
+                enquiry["phone"],
+                enquiry["enquiry_type"],
+                enquiry["additional_info"],
+                enquiry["submitted_at"],
+            ),
+        )
+        _enqueue_email(cursor, "contact_enquiry", {"enquiry": enquiry})
+        _bump_enquiry_stats(cursor, "contact", "no", 1)
+    return enquiry
+
+
+CONTACT_ENQUIRY_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "enquiry_type",
+    "additional_info",
+    "resolved",
+    "submitted_at",
+)
+CONTACT_ENQUIRY_COLUMNS = """id, first_name, last_name, email, phone,
+    enquiry_type, additional_info, resolved, submitted_at"""
+
+
+def get_all_contact_enquiries(fields=None, filters=None):
+    return get_contact_enquiries_page(limit=None, fields=fields, filters=filters)[0]
+
+
+def get_contact_enquiries_page(limit, cursor=None, fields=None, filters=None):
+    where, params = _filter_where(CONTACT_ENQUIRY_FILTERS, filters)
+    return _keyset_select(
+        CONTACT_ENQUIRY_COLUMNS,
+        "contact_enquiry",
+        "submitted_at",
+        where,
+        params,
+        limit,
+        cursor,
+        fields,
+    )
+
+
+def get_contact_enquiry_by_id(enquiry_id, fields=None):
+    columns = CONTACT_ENQUIRY_COLUMNS
+    if fields is not None:
+        columns = _select_list(fields)
     with get_db_cursor() as cursor:
         cursor.execute(
-            """SELECT id, first_name, last_name, email, phone, selected_property, 
-                  message, resolved, submitted_at 
-               FROM property_enquiry 
-               ORDER BY submitted_at DESC"""
+            f"SELECT {columns} FROM contact_enquiry WHERE id = %s", (enquiry_id,)
         )
-        return cursor.fetchall()
+        return cursor.fetchone()
 
 
-def get_property_enquiry_by_id(enquiry_id):
-    with get_db_cursor() as cursor:
+def mark_contact_enquiry_as_resolved(enquiry_id):
+    return _set_enquiry_resolved("contact", enquiry_id, "yes")
+
+
+def mark_contact_enquiry_as_unresolved(enquiry_id):
+    return _set_enquiry_resolved("contact", enquiry_id, "no")
+
+
+def delete_contact_enquiry(enquiry_id):
+    return _delete_enquiry("contact", enquiry_id)
+
+
+def _set_enquiry_resolved(kind, enquiry_id, resolved):
+    """
+    Set a property/contact enquiry's resolved flag ("yes" or "no").
+    Returns False when the enquiry does not exist or already has that value.
+    """
+    previous = "no" if resolved == "yes" else "yes"
+    with get_db_transaction() as cursor:
         cursor.execute(
-            """SELECT id, first_name, last_name, email, phone, selected_property, 
-                  message, resolved, submitted_at 
-               FROM property_enquiry 
-               WHERE id = %s""",
+            f"UPDATE {kind}_enquiry SET resolved = %s WHERE id = %s AND resolved = %s",
+            (resolved, enquiry_id, previous),
+        )
+        if cursor.rowcount == 0:
+            return False
+        _bump_enquiry_stats(cursor, kind, previous, -1)
+        _bump_enquiry_stats(cursor, kind, resolved, 1)
+        return True
+
+
+def _delete_enquiry(kind, enquiry_id):
+    with get_db_transaction() as cursor:
+        cursor.execute(
+            f"SELECT resolved FROM {kind}_enquiry WHERE id = %s FOR UPDATE",
             (enquiry_id,),
         )
-        return cursor.fetchone()
+        enquiry = cursor.fetchone()
+        if enquiry is None:
+            return False
+        cursor.execute(f"DELETE FROM {kind}_enquiry WHERE id = %s", (enquiry_id,))
+        _bump_enquiry_stats(cursor, kind, enquiry["resolved"], -1)
+        return True
 
 
-def mark_enquiry_as_resolved(enquiry_id):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
+# Reported under mark_enquiry_as_resolved, delete_contact_enquiry etc.
+QUERY_HELPERS.update(("_set_enquiry_resolved", "_delete_enquiry"))
+
+
+# Newsletter subscriber model function
+def add_newsletter_subscriber(email):
+    """
+    Adds a new subscriber to the newsletter.
+    Returns the subscriber id if successful, or None if email already exists.
+    """
+    subscriber_id = str(uuid.uuid4())
+    subscribed_at = _utc_now()
+    try:
+        with get_db_transaction() as cursor:
             cursor.execute(
-                "UPDATE property_enquiry SET resolved = 'yes' WHERE id = %s",
-                (enquiry_id,),
+                """INSERT INTO subscribers (id, email, subscribed_at) VALUES (%s, %s, %s)""",
+                (subscriber_id, email, subscribed_at),
             )
-            conn.commit()
-            return cursor.rowcount > 0
+            _enqueue_email(
+                cursor, "newsletter_welcome", {"email": email, "id": subscriber_id}
+            )
+            _bump_subscriber_stats(cursor, subscribed_at, 1)
+        return subscriber_id
+    except mysql.connector.IntegrityError as e:
+        # Only the unique email is expected to clash; anything else is a real error
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            return None
+        raise
 
 
-def mark_enquiry_as_unresolved(enquiry_id):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
+# Email outbox
+# Emails are written to email_outbox in the same transaction as the row that
+# triggered them and sent later by app/outbox.py, so requests never wait on Resend.
+def _enqueue_email(cursor, kind, payload):
+    cursor.execute(
+        "INSERT INTO email_outbox (id, kind, payload) VALUES (%s, %s, %s)",
+        (str(uuid.uuid4()), kind, json.dumps(payload, default=str)),
+    )
+
+
+def claim_outbox_emails(limit, lease_seconds):
+    """
+    Claim up to `limit` due outbox emails for this worker.
+    Claimed rows are pushed `lease_seconds` into the future, so a worker that
+    dies mid-send releases them automatically once the lease runs out.
+    """
+    with get_db_transaction() as cursor:
+        cursor.execute(
+            """SELECT id, kind, payload, attempts
+               FROM email_outbox
+               WHERE status = 'pending' AND next_attempt_at <= NOW()
+               ORDER BY next_attempt_at
+               LIMIT %s
+               FOR UPDATE SKIP LOCKED""",
+            (limit,),
+        )
+        emails = cursor.fetchall()
+
+        if emails:
+            placeholders = ", ".join(["%s"] * len(emails))
             cursor.execute(
-                "UPDATE property_enquiry SET resolved = 'no' WHERE id = %s",
-                (enquiry_id,),
+                f"""UPDATE email_outbox
+                    SET attempts = attempts + 1,
+                        next_attempt_at = NOW() + INTERVAL %s SECOND
+                    WHERE id IN ({placeholders})""",
+                [lease_seconds] + [email["id"] for email in emails],
             )
-            conn.commit()
-            return cursor.rowcount > 0
 
+    for email in emails:
+        payload = email["payload"]
+        if isinstance(payload, (bytes, bytearray)):
+            payload = payload.decode("utf-8")
+        email["payload"] = json.loads(payload)
+        email["attempts"] += 1
+    return emails
 
-def delete_property_enquiry(enquiry_id):
+
+def mark_outbox_email_sent(email_id):
     with get_db_cursor() as cursor:
-        cursor.execute("DELETE FROM property_enquiry WHERE id = %s", (enquiry_id,))
+        cursor.execute(
+            """UPDATE email_outbox
+               SET status = 'sent', sent_at = NOW(), last_error = NULL
+               WHERE id = %s""",
+            (email_id,),
+        )
         return cursor.rowcount > 0
 
 
-def create_contact_enquiry(enquiry_data):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            enquiry_id = str(uuid.uuid4())
-            cursor.execute(
-                """INSERT INTO contact_enquiry 
-                (id, first_name, last_name, email, phone, enquiry_type, additional_info) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (
-                    enquiry_id,
-                    enquiry_data["first_name"],
-                    enquiry_data["last_name"],
-                    enquiry_data["email"],
-                    enquiry_data["phone"],
-                    enquiry_data["enquiry_type"],
-                    enquiry_data.get("additional_info", ""),
-                ),
-            )
-            conn.commit()
-            return enquiry_id
+def mark_outbox_email_failed(email_id, error, retry_in_seconds, give_up=False):
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """UPDATE email_outbox
+               SET status = %s, last_error = %s,
+                   next_attempt_at = NOW() + INTERVAL %s SECOND
+               WHERE id = %s""",
+            ("failed" if give_up else "pending", error, retry_in_seconds, email_id),
+        )
+        return cursor.rowcount > 0
 
 
-def get_all_contact_enquiries():
+# Newsletter campaigns
+def create_newsletter_campaign(subject, content):
     with get_db_cursor() as cursor:
+        campaign_id = str(uuid.uuid4())
         cursor.execute(
-            """SELECT id, first_name, last_name, email, phone, enquiry_type, 
-                  additional_info, resolved, submitted_at 
-               FROM contact_enquiry 
-               ORDER BY submitted_at DESC"""
+            """INSERT INTO newsletter_campaigns (id, subject, content)
+               VALUES (%s, %s, %s)""",
+            (campaign_id, subject, content),
         )
-        return cursor.fetchall()
+        return campaign_id
 
 
-def get_contact_enquiry_by_id(enquiry_id):
+def get_newsletter_campaign(campaign_id):
     with get_db_cursor() as cursor:
         cursor.execute(
-            """SELECT id, first_name, last_name, email, phone, enquiry_type, 
-                  additional_info, resolved, submitted_at 
-               FROM contact_enquiry 
+            """SELECT id, subject, content, status, last_subscriber_id, sent_count,
+                  failed_count, last_error, created_at, updated_at, completed_at
+               FROM newsletter_campaigns
                WHERE id = %s""",
-            (enquiry_id,),
+            (campaign_id,),
         )
         return cursor.fetchone()
 
 
-def mark_contact_enquiry_as_resolved(enquiry_id):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(
-                "UPDATE contact_enquiry SET resolved = 'yes' WHERE id = %s",
-                (enquiry_id,),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+def get_resumable_campaign_ids():
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """SELECT id FROM newsletter_campaigns
+               WHERE status = 'pending'
+                  OR (status = 'running' AND locked_until < NOW())
+               ORDER BY created_at"""
+        )
+        return [row["id"] for row in cursor.fetchall()]
 
 
-def mark_contact_enquiry_as_unresolved(enquiry_id):
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(
-                "UPDATE contact_enquiry SET resolved = 'no' WHERE id = %s",
-                (enquiry_id,),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+def claim_newsletter_campaign(campaign_id, lease_seconds):
+    """
+    Take ownership of a campaign. Returns False if another runner holds a live
+    lease on it or it has already finished.
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """UPDATE newsletter_campaigns
+               SET status = 'running', locked_until = NOW() + INTERVAL %s SECOND
+               WHERE id = %s
+                 AND (status = 'pending'
+                      OR (status = 'running' AND locked_until < NOW()))""",
+            (lease_seconds, campaign_id),
+        )
+        return cursor.rowcount > 0
 
 
-def delete_contact_enquiry(enquiry_id):
+def checkpoint_newsletter_campaign(
+    campaign_id, last_subscriber_id, sent, failed, lease_seconds, error=None
+):
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """UPDATE newsletter_campaigns
+               SET last_subscriber_id = %s,
+                   sent_count = sent_count + %s,
+                   failed_count = failed_count + %s,
+                   last_error = COALESCE(%s, last_error),
+                   locked_until = NOW() + INTERVAL %s SECOND
+               WHERE id = %s""",
+            (last_subscriber_id, sent, failed, error, lease_seconds, campaign_id),
+        )
+        return cursor.rowcount > 0
+
 
+def finish_newsletter_campaign(campaign_id, status, error=None):
     with get_db_cursor() as cursor:
-        cursor.execute("DELETE FROM contact_enquiry WHERE id = %s", (enquiry_id,))
+        cursor.execute(
+            """UPDATE newsletter_campaigns
+               SET status = %s, last_error = COALESCE(%s, last_error),
+                   locked_until = NULL,
+                   completed_at = IF(%s = 'completed', NOW(), completed_at)
+               WHERE id = %s""",
+            (status, error, status, campaign_id),
+        )
         return cursor.rowcount > 0
 
 
-# Newsletter subscriber model function
-def add_newsletter_subscriber(email):
+def get_subscribers_after(after_id, limit, subscribed_before=None):
     """
-    Adds a new subscriber to the newsletter.
-    Returns the subscriber id if successful, or None if email already exists.
+    Keyset page of subscribers ordered by id, starting after `after_id`.
+    With `subscribed_before`, only subscribers who signed up before then.
     """
-    with get_db_connection() as conn:
-        with conn.cursor(dictionary=True) as cursor:
-            subscriber_id = str(uuid.uuid4())
-            try:
-                cursor.execute(
-                    """INSERT INTO subscribers (id, email) VALUES (%s, %s)""",
-                    (subscriber_id, email),
-                )
-                conn.commit()
-                return subscriber_id
-            except Exception as e:
-                # Duplicate email or other error
-                return None
+    conditions, params = [], []
+    if after_id is not None:
+        conditions.append("id > %s")
+        params.append(after_id)
+    if subscribed_before is not None:
+        conditions.append("subscribed_at < %s")
+        params.append(subscribed_before)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            f"SELECT id, email FROM subscribers {where} ORDER BY id LIMIT %s",
+            params + [limit],
+        )
+        return cursor.fetchall()
+
+
+# Dashboard stats
+# GET /stats reads the rollup tables from migration 0007 instead of scanning
+# orders, enquiries and subscribers. Every write above applies its change to
+# the rollups in its own transaction, as its last statements so the shared
+# per-day rows stay locked as briefly as possible; rebuild_stats() recomputes
+# them from the source tables.
+STATS_TABLES = (
+    "order_daily_stats",
+    "door_type_sales",
+    "enquiry_stats",
+    "subscriber_daily_stats",
+)
+
+
+def _bump_order_stats(
+    cursor, created_at, orders=0, confirmed_orders=0, revenue=0, confirmed_revenue=0
+):
+    cursor.execute(
+        """INSERT INTO order_daily_stats
+           (day, orders, confirmed_orders, revenue, confirmed_revenue)
+           VALUES (%s, %s, %s, %s, %s)
+           ON DUPLICATE KEY UPDATE
+               orders = orders + VALUES(orders),
+               confirmed_orders = confirmed_orders + VALUES(confirmed_orders),
+               revenue = revenue + VALUES(revenue),
+               confirmed_revenue = confirmed_revenue + VALUES(confirmed_revenue)""",
+        (created_at.date(), orders, confirmed_orders, revenue, confirmed_revenue),
+    )
+
+
+def _bump_door_type_sales(cursor, items, sign=1):
+    totals = {}
+    for item in items:
+        quantity, revenue = totals.get(item["door_type"] or "", (0, 0))
+        totals[item["door_type"] or ""] = (
+            quantity + item["quantity"],
+            revenue + item["unit_price"] * item["quantity"],
+        )
+    # Sorted so concurrent orders lock the shared rows in the same order
+    cursor.executemany(
+        """INSERT INTO door_type_sales (door_type, quantity, revenue)
+           VALUES (%s, %s, %s)
+           ON DUPLICATE KEY UPDATE
+               quantity = quantity + VALUES(quantity),
+               revenue = revenue + VALUES(revenue)""",
+        [
+            (door_type, sign * quantity, sign * revenue)
+            for door_type, (quantity, revenue) in sorted(totals.items())
+        ],
+    )
+
+
+def _bump_enquiry_stats(cursor, kind, resolved, delta):
+    cursor.execute(
+        """INSERT INTO enquiry_stats (kind, resolved, enquiries) VALUES (%s, %s, %s)
+           ON DUPLICATE KEY UPDATE enquiries = enquiries + VALUES(enquiries)""",
+        (kind, resolved, delta),
+    )
+
+
+def _bump_subscriber_stats(cursor, subscribed_at, delta):
+    cursor.execute(
+        """INSERT INTO subscriber_daily_stats (day, subscribers) VALUES (%s, %s)
+           ON DUPLICATE KEY UPDATE subscribers = subscribers + VALUES(subscribers)""",
+        (subscribed_at.date(), delta),
+    )
+
+
+# Rollup writes are reported under the model function that made the change
+QUERY_HELPERS.update(
+    (
+        "_bump_order_stats",
+        "_bump_door_type_sales",
+        "_bump_enquiry_stats",
+        "_bump_subscriber_stats",
+    )
+)
+
+
+def rebuild_stats():
+    """
+    Recompute every rollup table from the source tables in one transaction.
+    """
+    with get_db_transaction() as cursor:
+        for table in STATS_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(
+            """INSERT INTO order_daily_stats
+               (day, orders, confirmed_orders, revenue, confirmed_revenue)
+               SELECT DATE(created_at), COUNT(*), SUM(is_confirmed), SUM(total_price),
+                   SUM(IF(is_confirmed = 1, total_price, 0))
+               FROM orders
+               WHERE is_deleted = 0
+               GROUP BY DATE(created_at)"""
+        )
+        cursor.execute(
+            """INSERT INTO door_type_sales (door_type, quantity, revenue)
+               SELECT COALESCE(oi.door_type, ''), SUM(oi.quantity),
+                   SUM(oi.quantity * oi.unit_price)
+               FROM order_items oi
+               JOIN orders o ON o.id = oi.order_id
+               WHERE o.is_deleted = 0
+               GROUP BY COALESCE(oi.door_type, '')"""
+        )
+        for kind in ("property", "contact"):
+            cursor.execute(
+                f"""INSERT INTO enquiry_stats (kind, resolved, enquiries)
+                    SELECT %s, resolved, COUNT(*) FROM {kind}_enquiry GROUP BY resolved""",
+                (kind,),
+            )
+        cursor.execute(
+            """INSERT INTO subscriber_daily_stats (day, subscribers)
+               SELECT DATE(subscribed_at), COUNT(*)
+               FROM subscribers
+               GROUP BY DATE(subscribed_at)"""
+        )
+
+
+def get_dashboard_stats(days=30):
+    """
+    Totals for the admin dashboard, read from the rollup tables: orders and
+    revenue, sales by door type, open vs resolved enquiries and subscribers,
+    with per-day series covering the last `days` days.
+    """
+    since = _utc_now().date() - timedelta(days=days - 1)
+    with get_db_cursor() as cursor:
+        # One row per day, so these sums do not grow with the number of orders
+        cursor.execute(
+            """SELECT SUM(orders) AS orders, SUM(confirmed_orders) AS confirmed_orders,
+                   SUM(revenue) AS revenue, SUM(confirmed_revenue) AS confirmed_revenue
+               FROM order_daily_stats"""
+        )
+        totals = cursor.fetchone()
+        cursor.execute(
+            """SELECT day, orders, confirmed_orders, revenue, confirmed_revenue
+               FROM order_daily_stats
+               WHERE day >= %s AND orders > 0
+               ORDER BY day""",
+            (since,),
+        )
+        orders_by_day = cursor.fetchall()
+        cursor.execute(
+            """SELECT door_type, quantity, revenue
+               FROM door_type_sales
+               WHERE quantity > 0
+               ORDER BY revenue DESC, door_type"""
+        )
+        door_types = cursor.fetchall()
+        cursor.execute("SELECT kind, resolved, enquiries FROM enquiry_stats")
+        enquiries = {
+            kind: {"open": 0, "resolved": 0} for kind in ("property", "contact")
+        }
+        for row in cursor.fetchall():
+            state = "resolved" if row["resolved"] == "yes" else "open"
+            enquiries[row["kind"]][state] = int(row["enquiries"])
+        cursor.execute(
+            "SELECT SUM(subscribers) AS subscribers FROM subscriber_daily_stats"
+        )
+        subscribers = cursor.fetchone()["subscribers"]
+        cursor.execute(
+            """SELECT day, subscribers FROM subscriber_daily_stats
+               WHERE day >= %s AND subscribers > 0
+               ORDER BY day""",
+            (since,),
+        )
+        subscribers_by_day = cursor.fetchall()
+
+    # SUM() of an INT column is a DECIMAL in MySQL; days are ISO dates
+    for row in orders_by_day + subscribers_by_day:
+        row["day"] = str(row["day"])
+    return {
+        "orders": {
+            "total": int(totals["orders"] or 0),
+            "confirmed": int(totals["confirmed_orders"] or 0),
+            "revenue": totals["revenue"] or 0,
+            "confirmed_revenue": totals["confirmed_revenue"] or 0,
+            "by_day": orders_by_day,
+        },
+        "door_types": door_types,
+        "enquiries": enquiries,
+        "subscribers": {
+            "total": int(subscribers or 0),
+            "by_day": subscribers_by_day,
+        },
+        "days": days,
+    }
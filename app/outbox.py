@@ -0,0 +1,164 @@
+import threading
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from .models import (
+    claim_outbox_emails,
+    mark_outbox_email_sent,
+    mark_outbox_email_failed,
+)
+
+# Set whenever a request enqueues an email so idle workers wake up immediately
+_wakeup = threading.Event()
+
+
+def _send_order_confirmation(payload, idempotency_key):
+    from .email import send_order_confirmation
+
+    return send_order_confirmation(payload["order"], idempotency_key)
+
+
+def _send_property_enquiry(payload, idempotency_key):
+    from .email import send_property_enquiry_emails
+
+    return send_property_enquiry_emails(payload["enquiry"], idempotency_key)
+
+
+def _send_contact_enquiry(payload, idempotency_key):
+    from .email import send_contact_enquiry_emails
+
+    return send_contact_enquiry_emails(payload["enquiry"], idempotency_key)
+
+
+def _send_newsletter_welcome(payload, idempotency_key):
+    from .email import send_newsletter_welcome_email
+
+    return send_newsletter_welcome_email(payload, idempotency_key)
+
+
+EMAIL_HANDLERS = {
+    "order_confirmation": _send_order_confirmation,
+    "property_enquiry": _send_property_enquiry,
+    "contact_enquiry": _send_contact_enquiry,
+    "newsletter_welcome": _send_newsletter_welcome,
+}
+
+
+def notify_outbox():
+    """
+    Wake the background workers after a request has enqueued an email.
+    """
+    _wakeup.set()
+
+
+def dispatch_outbox(batch_size=None):
+    """
+    Send one batch of due outbox emails.
+    Returns a (claimed, sent) tuple.
+    """
+    config = current_app.config
+    max_attempts = config["EMAIL_OUTBOX_MAX_ATTEMPTS"]
+
+    emails = claim_outbox_emails(
+        batch_size or config["EMAIL_OUTBOX_BATCH_SIZE"],
+        config["EMAIL_OUTBOX_LEASE_SECONDS"],
+    )
+
+    sent = 0
+    for email in emails:
+        handler = EMAIL_HANDLERS.get(email["kind"])
+        error = None
+        try:
+            if handler is None:
+                error = f"No handler for email kind '{email['kind']}'"
+            # A row is retried as a whole, so each message it sends carries a
+            # key derived from the row id and Resend drops the ones already sent
+            elif not handler(email["payload"], f"outbox-{email['id']}"):
+                error = "Email handler reported a failed send"
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            mark_outbox_email_sent(email["id"])
+            sent += 1
+            continue
+
+        # Exponential backoff: 30s, 60s, 120s, ... capped
+        retry_in = min(
+            config["EMAIL_OUTBOX_RETRY_BASE_SECONDS"] * 2 ** (email["attempts"] - 1),
+            config["EMAIL_OUTBOX_RETRY_MAX_SECONDS"],
+        )
+        give_up = email["attempts"] >= max_attempts
+        mark_outbox_email_failed(email["id"], error, retry_in, give_up)
+        current_app.logger.error(
+            f"Outbox email {email['id']} ({email['kind']}) failed on attempt "
+            f"{email['attempts']}/{max_attempts}: {error}"
+        )
+
+    return len(emails), sent
+
+
+def _worker_loop(app):
+    with app.app_context():
+        batch_size = app.config["EMAIL_OUTBOX_BATCH_SIZE"]
+        poll_interval = app.config["EMAIL_OUTBOX_POLL_INTERVAL"]
+        while True:
+            try:
+                claimed, _ = dispatch_outbox(batch_size)
+            except Exception as e:
+                app.logger.error(f"Email outbox worker error: {str(e)}")
+                claimed = 0
+
+            # Keep draining while batches come back full, otherwise sleep until
+            # the next poll or until a request enqueues something new
+            if claimed < batch_size:
+                _wakeup.wait(poll_interval)
+                _wakeup.clear()
+
+
+def start_outbox_workers(app):
+    """
+    Start the background dispatchers for a serving process when
+    EMAIL_OUTBOX_WORKER is set. Returns the started threads.
+    """
+    if not app.config["EMAIL_OUTBOX_WORKER"]:
+        return []
+    threads = []
+    for i in range(app.config["EMAIL_OUTBOX_WORKERS"]):
+        thread = threading.Thread(
+            target=_worker_loop, args=(app,), name=f"email-outbox-{i}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+outbox_cli = AppGroup("outbox", help="Email outbox commands.")
+
+
+@outbox_cli.command("dispatch")
+@click.option("--batch-size", type=int, default=None, help="Emails per batch.")
+@click.option("--drain", is_flag=True, help="Keep going until nothing is due.")
+def dispatch_command(batch_size, drain):
+    """Send due emails from the outbox."""
+    total_claimed = total_sent = 0
+    batch_size = batch_size or current_app.config["EMAIL_OUTBOX_BATCH_SIZE"]
+    while True:
+        claimed, sent = dispatch_outbox(batch_size)
+        total_claimed += claimed
+        total_sent += sent
+        if not drain or claimed < batch_size:
+            break
+    click.echo(f"Claimed {total_claimed} email(s), sent {total_sent}.")
+
+
+@outbox_cli.command("work")
+def work_command():
+    """Run the background dispatchers in the foreground until interrupted."""
+    threads = start_outbox_workers(current_app._get_current_object())
+    if not threads:
+        click.echo("EMAIL_OUTBOX_WORKER is off.")
+    for thread in threads:
+        thread.join()
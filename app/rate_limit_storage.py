@@ -0,0 +1,230 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import urllib.parse
+from math import floor
+
+from limits.storage import Storage
+from limits.storage.base import (
+    SlidingWindowCounterSupport,
+    TimestampedSlidingWindow,
+)
+
+_MAGIC = b"AIRBANRL"
+_HEADER = struct.Struct("<8sQ")
+_HEADER_SIZE = 64
+# Per key: 64-bit key hash (0 = never used), counter, expiry (unix time)
+_SLOT = struct.Struct("<Qqd")
+_MAX_PROBES = 32
+
+
+class MmapStorage(
+    Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow
+):
+    """
+    Rate-limit counters in a memory-mapped file shared by every worker on
+    the host, e.g. ``mmap:///tmp/airban-ratelimit?slots=65536``.
+
+    The file is a fixed-size open-addressing hash table. Each operation takes
+    a process-local lock and an fcntl lock on the file, reads or updates a
+    few slots in place and releases both, so a check costs microseconds and
+    needs no external service. Expired slots are reused for new keys.
+    """
+
+    STORAGE_SCHEME = ["mmap"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        parsed = urllib.parse.urlparse(uri or "mmap:///tmp/airban-ratelimit")
+        query = urllib.parse.parse_qs(parsed.query)
+        self.path = parsed.path or "/tmp/airban-ratelimit"
+        slots = int(options.get("slots") or query.get("slots", [65536])[0])
+
+        self._lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self._fd).st_size
+            if size < _HEADER_SIZE:
+                # First process on the host creates the table
+                os.ftruncate(self._fd, _HEADER_SIZE + slots * _SLOT.size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots), 0)
+            else:
+                magic, slots = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+                if magic != _MAGIC:
+                    raise ValueError(f"{self.path} is not a rate limit table")
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+        self.slots = slots
+        self._map = mmap.mmap(self._fd, _HEADER_SIZE + slots * _SLOT.size)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError, struct.error)
+
+    def _locked(self):
+        return _TableLock(self._lock, self._fd)
+
+    def _offset(self, index):
+        return _HEADER_SIZE + index * _SLOT.size
+
+    def _hash(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def _find(self, key, now, create):
+        """
+        Return (offset, count, expiry) of the key's live slot. With create, a
+        missing key gets the first free or expired slot on its probe path
+        (count 0, expiry 0). Returns None if the key is absent (or the probe
+        path is full). Call with the table locked.
+        """
+        key_hash = self._hash(key)
+        start = key_hash % self.slots
+        free = None
+        for probe in range(_MAX_PROBES):
+            offset = self._offset((start + probe) % self.slots)
+            slot_hash, count, expiry = _SLOT.unpack_from(self._map, offset)
+            if slot_hash == key_hash:
+                if expiry > now:
+                    return offset, count, expiry
+                free = offset if free is None else free
+                break
+            if slot_hash == 0:
+                free = offset if free is None else free
+                break
+            if free is None and expiry <= now:
+                free = offset
+        if not create or free is None:
+            return None
+        _SLOT.pack_into(self._map, free, key_hash, 0, 0.0)
+        return free, 0, 0.0
+
+    def _incr(self, key, expiry, amount, now):
+        found = self._find(key, now, create=True)
+        if found is None:
+            # Table saturated along this probe path: fail open
+            return 0
+        offset, count, expires_at = found
+        if count == 0 and expires_at == 0.0:
+            expires_at = now + expiry
+        count += amount
+        _SLOT.pack_into(self._map, offset, self._hash(key), count, expires_at)
+        return count
+
+    def _get(self, key, now):
+        found = self._find(key, now, create=False)
+        return found[1] if found else 0
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        with self._locked():
+            return self._incr(key, expiry, amount, now)
+
+    def decr(self, key, amount=1):
+        now = time.time()
+        with self._locked():
+            found = self._find(key, now, create=False)
+            if found is None:
+                return 0
+            offset, count, expires_at = found
+            count = max(count - amount, 0)
+            _SLOT.pack_into(self._map, offset, self._hash(key), count, expires_at)
+            return count
+
+    def get(self, key):
+        now = time.time()
+        with self._locked():
+            return self._get(key, now)
+
+    def get_expiry(self, key):
+        now = time.time()
+        with self._locked():
+            found = self._find(key, now, create=False)
+        return found[2] if found else now
+
+    def clear(self, key):
+        with self._locked():
+            found = self._find(key, time.time(), create=False)
+            if found is not None:
+                # Keep the hash so later keys on the same probe path stay reachable
+                _SLOT.pack_into(self._map, found[0], self._hash(key), 0, 0.0)
+
+    def check(self):
+        return True
+
+    def reset(self):
+        now = time.time()
+        with self._locked():
+            live = 0
+            for index in range(self.slots):
+                if _SLOT.unpack_from(self._map, self._offset(index))[2] > now:
+                    live += 1
+            self._map[_HEADER_SIZE:] = bytes(self.slots * _SLOT.size)
+        return live
+
+    def _sliding_window(self, key, expiry, now):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(previous_key, now)
+        current_count = self._get(current_key, now)
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        # The check and the increment happen under one lock, so concurrent
+        # workers can never overshoot the limit
+        with self._locked():
+            previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                key, expiry, now
+            )
+            weighted = previous_count * previous_ttl / expiry + current_count
+            if floor(weighted) + amount > limit:
+                return False
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            self._incr(current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key, expiry):
+        now = time.time()
+        with self._locked():
+            return self._sliding_window(key, expiry, now)
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
+
+
+class _TableLock:
+    __slots__ = ("lock", "fd")
+
+    def __init__(self, lock, fd):
+        self.lock = lock
+        self.fd = fd
+
+    def __enter__(self):
+        # fcntl locks exclude other processes only; threads share the process lock
+        self.lock.acquire()
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX)
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN)
+        finally:
+            self.lock.release()
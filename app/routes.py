@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app, stream_with_context
 from .models import (
     get_door_by_id,
     get_all_doors,
@@ -23,17 +23,41 @@ from .models import (
     mark_contact_enquiry_as_resolved,
     mark_contact_enquiry_as_unresolved,
     delete_contact_enquiry,
+    create_newsletter_campaign,
+    get_newsletter_campaign,
+    invalidate_door_cache,
+    get_orders_page,
+    get_property_enquiries_page,
+    get_contact_enquiries_page,
+    iter_orders_with_items,
+    ORDER_EXPORT_FIELDS,
+    ORDER_EXPORT_ITEM_FIELDS,
+    get_doors_by_ids,
+    price_order_items,
+    get_db_pool_stats,
+    DOOR_FIELDS,
+    DOOR_LIST_FIELDS,
+    ORDER_FIELDS,
+    ORDER_LIST_FIELDS,
+    PROPERTY_ENQUIRY_FIELDS,
+    CONTACT_ENQUIRY_FIELDS,
+    ORDER_FILTERS,
+    PROPERTY_ENQUIRY_FILTERS,
+    CONTACT_ENQUIRY_FILTERS,
+    get_dashboard_stats,
 )
 
-from .email import (
-    send_order_confirmation,
-    send_property_enquiry_emails,
-    send_contact_enquiry_emails,
-    send_newsletter_welcome_email,
-)
+from .cache import catalog_cache
+from .compression import choose_encoding, compress_body
+from .metrics import render_metrics
+from .startup import startup_report
+from .outbox import notify_outbox, dispatch_outbox
+from .campaigns import start_campaign_in_background
+import csv
+import hashlib
+import io
 import uuid
-
-import resend
+from datetime import datetime, timedelta
 
 main = Blueprint("main", __name__)
 
@@ -49,11 +73,167 @@ def test_db():
         return jsonify({"error": str(e)})
 
 
+@main.route("/db-pool-stats")
+def db_pool_stats():
+    """
+    Live connection pool statistics for this worker process
+    """
+    return jsonify({"pool": get_db_pool_stats(), "catalog_cache": catalog_cache.stats()})
+
+
+@main.route("/startup-stats")
+def startup_stats():
+    """
+    Cold start timings for this worker process
+    """
+    return jsonify(startup_report())
+
+
+@main.route("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint
+    """
+    if not current_app.config["METRICS_ENABLED"]:
+        return jsonify({"error": "Metrics are disabled"}), 404
+    return current_app.response_class(
+        render_metrics(), mimetype="text/plain; version=0.0.4"
+    )
+
+
+def _serialize_catalog(value):
+    body = f"{current_app.json.dumps(value)}\n".encode("utf-8")
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+def _catalog_response(cache_key, value):
+    """
+    JSON response for a cached catalog read with a strong ETag and shared-cache
+    Cache-Control. The body and its ETag are built once per catalog cache entry
+    (and once per Content-Encoding) and a matching If-None-Match gets a 304.
+    """
+    body, etag = catalog_cache.get_derived(cache_key, value, "json", _serialize_catalog)
+    encoding = choose_encoding(len(body))
+    if encoding is not None:
+        # Compressed once per catalog entry at the highest level, then reused.
+        # Uncached values (CATALOG_CACHE_TTL=0) use the per-request level.
+        cached = catalog_cache.holds(cache_key, value)
+        body, etag = catalog_cache.get_derived(
+            cache_key,
+            value,
+            f"json.{encoding}",
+            lambda _: (compress_body(body, encoding, cached), f"{etag}-{encoding}"),
+        )
+    response = current_app.response_class(body, mimetype="application/json")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = current_app.config["CATALOG_CACHE_CONTROL"]
+    return response.make_conditional(request)
+
+
+def _page_args():
+    """
+    Read ?limit= and ?cursor= for keyset-paginated listings.
+    Returns None when neither is given so the full list is returned as before.
+    """
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is None and cursor is None:
+        return None
+    try:
+        limit = int(limit) if limit is not None else current_app.config["PAGE_SIZE_DEFAULT"]
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit <= 0:
+        raise ValueError("limit must be positive")
+    return min(limit, current_app.config["PAGE_SIZE_MAX"]), cursor
+
+
+def _fields_arg(allowed):
+    """
+    Read ?fields=a,b (a sparse fieldset) and check it against the resource's
+    whitelist. Returns None when absent so every field is returned as before;
+    otherwise a sorted tuple, so equivalent requests share cache entries.
+    """
+    raw = request.args.get("fields")
+    if raw is None:
+        return None
+    fields = {field.strip() for field in raw.split(",") if field.strip()}
+    if not fields:
+        raise ValueError("fields must name at least one field")
+    unknown = sorted(fields.difference(allowed))
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return tuple(sorted(fields))
+
+
+def _parse_flag(value):
+    lowered = value.lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ValueError(f"Expected true or false, got '{value}'")
+
+
+def _parse_date(value, end=False):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Expected an ISO date or datetime, got '{value}'")
+    # A bare date as the upper bound includes that whole day
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+_FILTER_PARSERS = {
+    "confirmed": lambda value: int(_parse_flag(value)),
+    "resolved": lambda value: "yes" if _parse_flag(value) else "no",
+    "from": _parse_date,
+    "to": lambda value: _parse_date(value, end=True),
+    "q": lambda value: value[:200],
+}
+
+
+def _filter_args(allowed):
+    """
+    Read the listing filters named in `allowed` (e.g. ?confirmed=true&from=
+    2025-01-01&q=mensah). Absent or empty parameters are not applied.
+    """
+    filters = {}
+    for name in allowed:
+        value = request.args.get(name, "").strip()
+        if value:
+            try:
+                filters[name] = _FILTER_PARSERS.get(name, str)(value)
+            except ValueError as e:
+                raise ValueError(f"Invalid {name}: {e}")
+    return filters
+
+
+def _listing_response(get_all, get_page, allowed_fields, allowed_filters):
+    fields = _fields_arg(allowed_fields)
+    filters = _filter_args(allowed_filters)
+    page = _page_args()
+    if page is None:
+        return jsonify(get_all(fields=fields, filters=filters)), 200
+    rows, next_cursor = get_page(*page, fields=fields, filters=filters)
+    return jsonify({"items": rows, "next_cursor": next_cursor}), 200
+
+
 @main.route("/doors", methods=["GET"])
 def get_doors():
     try:
-        doors = get_all_doors()
-        return jsonify(doors)
+        fields = _fields_arg(DOOR_LIST_FIELDS)
+        doors = get_all_doors(fields)
+        return _catalog_response(("doors", fields), doors)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -61,10 +241,13 @@ def get_doors():
 @main.route("/doors/<door_id>", methods=["GET"])
 def single_door(door_id):
     try:
-        door = get_door_by_id(door_id)
+        fields = _fields_arg(DOOR_FIELDS)
+        door = get_door_by_id(door_id, fields)
         if not door:
             return jsonify({"error": "Door not found"}), 404
-        return jsonify(door), 200
+        return _catalog_response(("door", door_id, fields), door)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -135,6 +318,8 @@ def create_door():
 
                 conn.commit()
 
+        invalidate_door_cache()
+
         return (
             jsonify({"message": "Door created successfully", "door_id": door_id}),
             201,
@@ -144,6 +329,48 @@ def create_door():
         return jsonify({"error": str(e)}), 500
 
 
+# Hydrate a cart or quote in one call instead of one GET /doors/<id> per line.
+# Body: {"ids": [...]} for doors only, or {"items": [{door_id, quantity,
+# orientation}]} to also get a quote priced the same way as POST /orders.
+@main.route("/doors/batch", methods=["POST"])
+def batch_doors():
+    try:
+        data = request.get_json() or {}
+        items = data.get("items")
+        if items is not None:
+            if not isinstance(items, list) or len(items) == 0:
+                return jsonify({"error": "Items must be a non-empty array"}), 400
+            error = _validate_order_items(items)
+            if error:
+                return jsonify({"error": error}), 400
+            door_ids = [item["door_id"] for item in items]
+        else:
+            door_ids = data.get("ids")
+            if not isinstance(door_ids, list) or len(door_ids) == 0:
+                return jsonify({"error": "Provide a non-empty ids or items array"}), 400
+
+        max_ids = current_app.config["DOOR_BATCH_MAX_IDS"]
+        if len(door_ids) > max_ids:
+            return jsonify({"error": f"At most {max_ids} doors per request"}), 400
+
+        unique_ids = list(dict.fromkeys(door_ids))
+        doors = get_doors_by_ids(unique_ids)
+        result = {
+            "doors": [doors[door_id] for door_id in unique_ids if door_id in doors],
+            "missing": [door_id for door_id in unique_ids if door_id not in doors],
+        }
+
+        if items is not None and not result["missing"]:
+            quote_items, total_price = price_order_items(items, doors)
+            for item in quote_items:
+                item["line_total"] = item["unit_price"] * item["quantity"]
+            result["quote"] = {"items": quote_items, "total_price": total_price}
+
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @main.route("/doors/<door_id>", methods=["DELETE"])
 def delete_door_route(door_id):
     try:
@@ -198,6 +425,17 @@ def update_door_route(door_id):
         return jsonify({"error": str(e)}), 500
 
 
+def _validate_order_items(items):
+    for item in items:
+        if not all(k in item for k in ["door_id", "quantity"]):
+            return "Each item must have door_id and quantity"
+        if item["quantity"] <= 0:
+            return "Quantity must be positive"
+        if "orientation" in item and item["orientation"] not in ["left", "right"]:
+            return "Orientation must be either 'left' or 'right'"
+    return None
+
+
 @main.route("/orders", methods=["POST"])
 def create_order_route():
     try:
@@ -224,26 +462,14 @@ def create_order_route():
         if not isinstance(data["items"], list) or len(data["items"]) == 0:
             return jsonify({"error": "Items must be a non-empty array"}), 400
 
-        for item in data["items"]:
-            if not all(k in item for k in ["door_id", "quantity"]):
-                return (
-                    jsonify({"error": "Each item must have door_id and quantity"}),
-                    400,
-                )
-            if item["quantity"] <= 0:
-                return jsonify({"error": "Quantity must be positive"}), 400
-
-            if "orientation" in item and item["orientation"] not in ["left", "right"]:
-                return (
-                    jsonify({"error": "Orientation must be either 'left' or 'right'"}),
-                    400,
-                )
+        error = _validate_order_items(data["items"])
+        if error:
+            return jsonify({"error": error}), 400
 
         # Create the order
-        order_id = create_order(data)
-        order = get_order_by_id(order_id)
+        order = create_order(data)
 
-        send_order_confirmation(order)
+        notify_outbox()
 
         return jsonify({"message": "Order created successfully", "order": order}), 201
 
@@ -256,19 +482,68 @@ def create_order_route():
 @main.route("/orders", methods=["GET"])
 def get_orders():
     try:
-        orders = get_all_orders()
-        return jsonify(orders)
+        return _listing_response(
+            get_all_orders, get_orders_page, ORDER_LIST_FIELDS, ORDER_FILTERS
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _export_ndjson():
+    for order in iter_orders_with_items():
+        yield f"{current_app.json.dumps(order)}\n"
+
+
+def _export_csv():
+    # One line per order item, with the order columns repeated
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        ORDER_EXPORT_FIELDS + [f"item_{field}" for field in ORDER_EXPORT_ITEM_FIELDS]
+    )
+    for order in iter_orders_with_items():
+        order_columns = [order[field] for field in ORDER_EXPORT_FIELDS]
+        for item in order["items"] or [{}]:
+            writer.writerow(
+                order_columns + [item.get(field) for field in ORDER_EXPORT_ITEM_FIELDS]
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@main.route("/orders/export", methods=["GET"])
+def export_orders():
+    export_format = request.args.get("format", "ndjson")
+    exporters = {
+        "ndjson": (_export_ndjson, "application/x-ndjson"),
+        "csv": (_export_csv, "text/csv"),
+    }
+    if export_format not in exporters:
+        return jsonify({"error": "format must be either 'ndjson' or 'csv'"}), 400
+
+    generate, mimetype = exporters[export_format]
+    return current_app.response_class(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="orders.{export_format}"'
+        },
+    )
+
+
 @main.route("/orders/<order_id>", methods=["GET"])
 def get_order(order_id):
     try:
-        order = get_order_by_id(order_id)
+        fields = _fields_arg(ORDER_FIELDS)
+        order = get_order_by_id(order_id, fields)
         if not order:
             return jsonify({"error": "Order not found"}), 404
         return jsonify(order), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -306,6 +581,8 @@ def delete_order_route(order_id):
 
 @main.route("/test-email")
 def test_email():
+    import resend
+
     try:
         resend.api_key = current_app.config["RESEND_API_KEY"]
 
@@ -326,6 +603,17 @@ def test_email():
         return jsonify({"error": str(e)}), 500
 
 
+# Drain the email outbox on demand (e.g. from a scheduler on serverless hosts
+# where background workers are frozen between requests)
+@main.route("/outbox/dispatch", methods=["POST"])
+def dispatch_outbox_route():
+    try:
+        claimed, sent = dispatch_outbox()
+        return jsonify({"claimed": claimed, "sent": sent}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # Property Enquiry Routes
 @main.route("/property", methods=["POST"])
 def create_property_enquiry_route():
@@ -344,18 +632,17 @@ def create_property_enquiry_route():
             if not data.get(field):
                 return jsonify({"error": f"Missing required field: {field}"}), 400
 
-        enquiry_id = create_property_enquiry(data)
+        enquiry = create_property_enquiry(data)
 
-        # Get the full enquiry data to send email
-        enquiry = get_property_enquiry_by_id(enquiry_id)
-        if enquiry:
-            send_property_enquiry_emails(enquiry)
+        # Confirmation emails were queued with the enquiry
+        notify_outbox()
 
         return (
             jsonify(
                 {
                     "message": "Property enquiry submitted successfully",
-                    "enquiry_id": enquiry_id,
+                    "enquiry_id": enquiry["id"],
+                    "enquiry": enquiry,
                 }
             ),
             201,
@@ -368,8 +655,14 @@ def create_property_enquiry_route():
 @main.route("/property", methods=["GET"])
 def get_property_enquiries():
     try:
-        enquiries = get_all_property_enquiries()
-        return jsonify(enquiries), 200
+        return _listing_response(
+            get_all_property_enquiries,
+            get_property_enquiries_page,
+            PROPERTY_ENQUIRY_FIELDS,
+            PROPERTY_ENQUIRY_FILTERS,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -377,10 +670,13 @@ def get_property_enquiries():
 @main.route("/property/<enquiry_id>", methods=["GET"])
 def get_single_property_enquiry(enquiry_id):
     try:
-        enquiry = get_property_enquiry_by_id(enquiry_id)
+        fields = _fields_arg(PROPERTY_ENQUIRY_FIELDS)
+        enquiry = get_property_enquiry_by_id(enquiry_id, fields)
         if not enquiry:
             return jsonify({"error": "Property enquiry not found"}), 404
         return jsonify(enquiry), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -435,18 +731,17 @@ def create_contact_enquiry_route():
                 400,
             )
 
-        enquiry_id = create_contact_enquiry(data)
+        enquiry = create_contact_enquiry(data)
 
-        # Get the full enquiry data to send email
-        enquiry = get_contact_enquiry_by_id(enquiry_id)
-        if enquiry:
-            send_contact_enquiry_emails(enquiry)
+        # Confirmation emails were queued with the enquiry
+        notify_outbox()
 
         return (
             jsonify(
                 {
                     "message": "Contact enquiry submitted successfully",
-                    "enquiry_id": enquiry_id,
+                    "enquiry_id": enquiry["id"],
+                    "enquiry": enquiry,
                 }
             ),
             201,
@@ -459,8 +754,14 @@ def create_contact_enquiry_route():
 @main.route("/contact", methods=["GET"])
 def get_contact_enquiries():
     try:
-        enquiries = get_all_contact_enquiries()
-        return jsonify(enquiries), 200
+        return _listing_response(
+            get_all_contact_enquiries,
+            get_contact_enquiries_page,
+            CONTACT_ENQUIRY_FIELDS,
+            CONTACT_ENQUIRY_FILTERS,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -468,10 +769,13 @@ def get_contact_enquiries():
 @main.route("/contact/<enquiry_id>", methods=["GET"])
 def get_contact_enquiry(enquiry_id):
     try:
-        enquiry = get_contact_enquiry_by_id(enquiry_id)
+        fields = _fields_arg(CONTACT_ENQUIRY_FIELDS)
+        enquiry = get_contact_enquiry_by_id(enquiry_id, fields)
         if not enquiry:
             return jsonify({"error": "Contact enquiry not found"}), 404
         return jsonify(enquiry), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -524,7 +828,7 @@ def subscribe_newsletter():
 
         subscriber_id = add_newsletter_subscriber(email)
         if subscriber_id:
-            send_newsletter_welcome_email({"email": email, "id": subscriber_id})
+            notify_outbox()
             return (
                 jsonify({"message": "Subscribed successfully", "id": subscriber_id}),
                 201,
@@ -533,3 +837,52 @@ def subscribe_newsletter():
             return jsonify({"error": "Email already subscribed or invalid"}), 409
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+# Newsletter campaign routes
+@main.route("/campaigns", methods=["POST"])
+def create_campaign_route():
+    try:
+        data = request.get_json()
+        subject = data.get("subject")
+        content = data.get("content")
+        if not subject or not content:
+            return jsonify({"error": "Missing required fields (subject, content)"}), 400
+
+        campaign_id = create_newsletter_campaign(subject, content)
+        start_campaign_in_background(current_app._get_current_object(), campaign_id)
+
+        return (
+            jsonify({"message": "Campaign started", "campaign_id": campaign_id}),
+            202,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@main.route("/campaigns/<campaign_id>", methods=["GET"])
+def get_campaign_route(campaign_id):
+    try:
+        campaign = get_newsletter_campaign(campaign_id)
+        if not campaign:
+            return jsonify({"error": "Campaign not found"}), 404
+        return jsonify(campaign), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Dashboard totals, answered from the rollup tables
+@main.route("/stats", methods=["GET"])
+def dashboard_stats():
+    try:
+        try:
+            days = int(request.args.get("days", 30))
+        except ValueError:
+            raise ValueError("days must be an integer")
+        if not 1 <= days <= 366:
+            raise ValueError("days must be between 1 and 366")
+        return jsonify(get_dashboard_stats(days)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,157 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from .db_pool import INHERITED_CONNECTIONS, QUERY_OBSERVERS
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_PLAN_COLUMNS = (
+    "id", "select_type", "table", "type", "key", "rows", "filtered", "Extra"
+)
+
+_settings = {"threshold": 0.2, "explain": True, "cooldown": 60}
+
+# EXPLAINs run one at a time on their own connection, off the request thread
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query")
+_explain_conn = None
+_last_explained = {}
+_lock = threading.Lock()
+
+
+def normalize_sql(operation):
+    """
+    Reduce a statement to its shape: literals become ?, IN lists collapse,
+    whitespace is squeezed. Queries that differ only in values normalize
+    to the same string.
+    """
+    if isinstance(operation, bytes):
+        operation = operation.decode("utf-8", "replace")
+    sql = re.sub(r"'(?:[^'\\]|\\.|'')*'", "?", operation)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = sql.replace("%s", "?")
+    sql = re.sub(r"\s+", " ", sql).strip()
+    return re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", sql)
+
+
+def params_shape(params):
+    """
+    Describe parameters by type only, e.g. "tuple[3](str, int, datetime)",
+    so no customer data ends up in the log.
+    """
+    if params is None:
+        return "none"
+    if isinstance(params, dict):
+        return "dict(" + ", ".join(
+            f"{key}: {type(value).__name__}" for key, value in params.items()
+        ) + ")"
+    if isinstance(params, (list, tuple)):
+        if params and isinstance(params[0], (list, tuple, dict)):
+            # executemany: describe the first row
+            return f"{len(params)} x {params_shape(params[0])}"
+        types = ", ".join(type(value).__name__ for value in params)
+        return f"{type(params).__name__}[{len(params)}]({types})"
+    return type(params).__name__
+
+
+def _format_plan(rows):
+    return "\n".join(
+        "  " + " ".join(f"{column}={row.get(column)}" for column in _PLAN_COLUMNS)
+        for row in rows
+    )
+
+
+def _explain(logger, operation, params, caller, sql):
+    global _explain_conn
+    try:
+        if _explain_conn is None:
+            from .models import db_pool
+
+            _explain_conn = db_pool.open_unpooled()
+        cursor = _explain_conn.cursor(dictionary=True)
+        try:
+            cursor.execute(f"EXPLAIN {operation}", params)
+            plan = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception as e:
+        # Drop the connection so the next EXPLAIN reconnects
+        try:
+            if _explain_conn is not None:
+                _explain_conn.close()
+        except Exception:
+            pass
+        _explain_conn = None
+        logger.warning(f"Could not EXPLAIN slow query in {caller}: {str(e)}")
+        return
+
+    # MySQL's estimate of rows examined is the product of the per-table row
+    # counts for joins; the sum is a simpler, still comparable, signal
+    examined = sum(int(row.get("rows") or 0) for row in plan)
+    logger.warning(
+        f"EXPLAIN for slow query in {caller} (~{examined} rows examined): "
+        f"{sql}\n{_format_plan(plan)}"
+    )
+
+
+def _observe_query(operation, params, seconds, caller, cursor):
+    if seconds < _settings["threshold"]:
+        return
+
+    logger = current_app.logger
+    sql = normalize_sql(operation)
+    rowcount = getattr(cursor, "rowcount", -1)
+    logger.warning(
+        f"Slow query ({seconds * 1000:.1f} ms) in {caller}: {sql} "
+        f"params={params_shape(params)} rows={rowcount}"
+    )
+
+    if not _settings["explain"] or not sql.upper().startswith(_EXPLAINABLE):
+        return
+    # executemany batches are explained with their first row
+    if isinstance(params, list) and params and isinstance(params[0], (list, tuple)):
+        params = params[0]
+
+    # Explain each statement shape at most once per cooldown
+    now = time.monotonic()
+    cooldown = _settings["cooldown"]
+    with _lock:
+        if now - _last_explained.get(sql, -cooldown) < cooldown:
+            return
+        if len(_last_explained) > 1000:
+            _last_explained.clear()
+        _last_explained[sql] = now
+    _explain_executor.submit(_explain, logger, operation, params, caller, sql)
+
+
+def _reset_after_fork():
+    global _explain_executor, _explain_conn, _lock
+    # The executor's thread and the EXPLAIN connection belong to the parent
+    _explain_executor = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="slow-query"
+    )
+    if _explain_conn is not None:
+        INHERITED_CONNECTIONS.append(_explain_conn)
+        _explain_conn = None
+    _last_explained.clear()
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def init_slow_query_log(app):
+    """
+    Log statements slower than SLOW_QUERY_THRESHOLD_MS from any pooled
+    connection (get_db_cursor, get_db_connection, get_db_transaction).
+    """
+    if not app.config["SLOW_QUERY_LOG"]:
+        return
+    _settings["threshold"] = app.config["SLOW_QUERY_THRESHOLD_MS"] / 1000
+    _settings["explain"] = app.config["SLOW_QUERY_EXPLAIN"]
+    _settings["cooldown"] = app.config["SLOW_QUERY_EXPLAIN_COOLDOWN"]
+    if _observe_query not in QUERY_OBSERVERS:
+        QUERY_OBSERVERS.append(_observe_query)
@@ -0,0 +1,108 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, request
+
+# Named startup phases in milliseconds
+_phases = {}
+_first_request = {}
+_lock = threading.Lock()
+_ready_at = None
+
+
+@contextmanager
+def startup_phase(name):
+    """
+    Time one step of app startup for the startup report.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = round((time.perf_counter() - start) * 1000, 3)
+
+
+def record_phase(name, started):
+    _phases[name] = round((time.perf_counter() - started) * 1000, 3)
+
+
+def mark_ready():
+    """
+    Called when create_app() returns; the first request is timed from here.
+    """
+    global _ready_at
+    _ready_at = time.perf_counter()
+
+
+def _lazy_state():
+    from . import models
+
+    return {
+        "db_pool": models.db_pool is not None,
+        "email": "app.email" in sys.modules,
+        "resend": "resend" in sys.modules,
+    }
+
+
+def startup_report():
+    """
+    Cold start timings for this process: package import and create_app()
+    phases, then the first request (its own duration and how long after
+    create_app() returned it completed), plus which lazy parts are loaded.
+    The db_pool and routes phases are part of create_app.
+    """
+    total = _phases.get("import", 0) + _phases.get("create_app", 0)
+    report = {
+        "phases_ms": dict(_phases),
+        "startup_ms": round(total, 3),
+        "first_request": dict(_first_request) or None,
+        "modules_loaded": len(sys.modules),
+        "lazy_loaded": _lazy_state(),
+    }
+    if _first_request:
+        report["cold_start_ms"] = round(total + _first_request["duration_ms"], 3)
+    return report
+
+
+def _before_first_request():
+    if not _first_request:
+        g.startup_request_started = time.perf_counter()
+
+
+def _after_first_request(response):
+    started = g.pop("startup_request_started", None)
+    if started is None:
+        return response
+    with _lock:
+        if _first_request:
+            return response
+        now = time.perf_counter()
+        _first_request.update(
+            {
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                "duration_ms": round((now - started) * 1000, 3),
+                "after_ready_ms": round((now - _ready_at) * 1000, 3),
+            }
+        )
+        report = startup_report()
+        budget = current_app.config["STARTUP_BUDGET_MS"]
+        if budget and report["cold_start_ms"] > budget:
+            current_app.logger.warning(
+                f"Cold start took {report['cold_start_ms']:.0f} ms "
+                f"(budget {budget:.0f} ms): {report['phases_ms']}"
+            )
+        else:
+            current_app.logger.info(f"Cold start report: {report}")
+    return response
+
+
+def init_startup_report(app):
+    """
+    Register the hooks that time the first request. Call first in
+    create_app() so the other before_request hooks are inside the timing.
+    """
+    app.before_request(_before_first_request)
+    app.after_request(_after_first_request)
@@ -0,0 +1,173 @@
+"""
+Cold start benchmark.
+
+Starts a fresh interpreter per run, imports run.py (which calls create_app())
+and serves one GET /doors through a test client against the SQLite stand-in,
+then reads the app's startup report. Exits non-zero if the median fast-start
+cold start is over --budget-ms. Three modes are compared:
+
+    pre_series  FAST_START off, plus the resend and app.email imports that
+                routes.py and campaigns.py made at module level before emails
+                were loaded on first send
+    eager       FAST_START off
+    fast_start  FAST_START on
+
+resend and app.email load lazily in both eager and fast_start, and the pool
+opens no connections until first use, so all FAST_START still changes is
+that create_app() does not build the (empty) pool object and the email
+outbox dispatchers default to off (they are off in every mode here). Most of
+the saving shows up against pre_series. The stand-in has no network, so the
+cost of opening MySQL connections is not measured in any mode.
+
+    python benchmarks/bench_cold_start.py [--runs 5] [--budget-ms 500]
+        [--json] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Included in the report so eager vs fast_start is read for what it is
+FAST_START_CHANGES = (
+    "FAST_START only skips building the (empty) pool object in create_app() "
+    "and defaults the outbox dispatchers off; email modules load lazily and "
+    "the pool connects on first use in both modes"
+)
+
+# Runs in the child interpreter: the timer starts before anything is imported
+CHILD = """
+import json, os, sys, time
+started = time.perf_counter()
+sys.path[:0] = [{root!r}, {benchmarks!r}]
+import run
+app = run.app
+email_imports_ms = 0
+if {email_imports!r}:
+    email_started = time.perf_counter()
+    import resend as _resend
+    import app.email as _email
+    email_imports_ms = round((time.perf_counter() - email_started) * 1000, 3)
+import app.models as models
+from sqlite_backend import connect_factory
+# Drop the MySQL pool an eager start created; the SQLite one replaces it
+models.db_pool = None
+real_init_db_pool = models.init_db_pool
+models.init_db_pool = lambda: real_init_db_pool(connect=connect_factory({db!r}))
+response = app.test_client().get("/doors")
+from app.startup import startup_report
+report = startup_report()
+if email_imports_ms:
+    report["phases_ms"]["email_imports"] = email_imports_ms
+    report["cold_start_ms"] = round(report["cold_start_ms"] + email_imports_ms, 3)
+report["process_ms"] = round((time.perf_counter() - started) * 1000, 3)
+report["status"] = response.status_code
+print(json.dumps(report))
+"""
+
+
+def run_once(db_path, fast_start, email_imports=False):
+    env = dict(
+        os.environ,
+        FAST_START="true" if fast_start else "false",
+        EMAIL_OUTBOX_WORKER="false",
+        METRICS_DIR="",
+        SLOW_QUERY_LOG="false",
+        RATELIMIT_STORAGE_URI="memory://",
+    )
+    code = CHILD.format(
+        root=ROOT,
+        benchmarks=os.path.join(ROOT, "benchmarks"),
+        db=db_path,
+        email_imports=email_imports,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarise(reports):
+    def median(values):
+        return round(statistics.median(values), 3)
+
+    return {
+        "import_ms": median([r["phases_ms"]["import"] for r in reports]),
+        "create_app_ms": median([r["phases_ms"]["create_app"] for r in reports]),
+        "first_request_ms": median(
+            [r["first_request"]["duration_ms"] for r in reports]
+        ),
+        "cold_start_ms": median([r["cold_start_ms"] for r in reports]),
+        "process_ms": median([r["process_ms"] for r in reports]),
+        "modules_loaded": reports[-1]["modules_loaded"],
+        "lazy_loaded": reports[-1]["lazy_loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=0)
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    parser.add_argument("--output", help="Also write the JSON results here.")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from sqlite_backend import create_database
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="airban-cold-"), "db.sqlite3")
+    create_database(db_path)
+
+    results = {}
+    modes = [
+        ("pre_series", False, True),
+        ("eager", False, False),
+        ("fast_start", True, False),
+    ]
+    for mode, fast_start, email_imports in modes:
+        reports = [
+            run_once(db_path, fast_start, email_imports) for _ in range(args.runs)
+        ]
+        results[mode] = summarise(reports)
+        if not args.json:
+            r = results[mode]
+            print(
+                f"{mode:<11} import {r['import_ms']:>7.1f} ms  "
+                f"create_app {r['create_app_ms']:>6.1f} ms  "
+                f"first request {r['first_request_ms']:>6.1f} ms  "
+                f"cold start {r['cold_start_ms']:>7.1f} ms  "
+                f"({r['modules_loaded']} modules)"
+            )
+
+    over_budget = bool(
+        args.budget_ms and results["fast_start"]["cold_start_ms"] > args.budget_ms
+    )
+    report = {
+        "benchmark": "cold_start",
+        "settings": {"runs": args.runs, "budget_ms": args.budget_ms},
+        "modes": results,
+        "fast_start_changes": FAST_START_CHANGES,
+        "over_budget": over_budget,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.json:
+        print(output)
+    else:
+        print(f"Note: {FAST_START_CHANGES}")
+        if over_budget:
+            print(f"Cold start is over the {args.budget_ms:.0f} ms budget")
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Micro-benchmark for the email templates in app/templates/email.
+
+Compares the cached, pre-minified environment used by app/email.py against a
+plain environment that recompiles the unminified template on every render,
+and reports render time and output size per template.
+
+    python benchmarks/bench_email_templates.py [--iterations 2000] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+
+from app.email_templates import (  # noqa: E402
+    TEMPLATE_DIR,
+    get_email_template_names,
+    precompile_email_templates,
+    render_email_template,
+)
+
+ORDER = {
+    "id": "7d0f6a52-8a52-4c09-9a39-3f1f8f2b8d11",
+    "customer_name": "Ama Mensah",
+    "email": "ama@example.com",
+    "phone_number": "+233 20 000 0000",
+    "location": "East Legon, Accra",
+    "notes": "Please call before delivery",
+    "total_price": Decimal("12500.00"),
+    "created_at": datetime(2025, 8, 1, 10, 30),
+    "items": [
+        {
+            "door_id": f"door-{i}",
+            "door_name": f"Mahogany Panel {i}",
+            "door_type": "Double" if i % 2 else "Single",
+            "quantity": i + 1,
+            "unit_price": Decimal("2500.00"),
+            "orientation": "left",
+        }
+        for i in range(10)
+    ],
+}
+
+ENQUIRY = {
+    "id": "3c1d7e0e-2b7f-4f53-8f5e-6a0d9f0b4e21",
+    "first_name": "Kofi",
+    "last_name": "Boateng",
+    "email": "kofi@example.com",
+    "phone": "+233 24 000 0000",
+    "selected_property": "Airban Villas Block C",
+    "enquiry_type": "Sales",
+    "message": "I would like to book a viewing next week.",
+    "additional_info": "Prefer weekend appointments.",
+}
+
+CONTEXTS = {
+    "order_confirmation_customer.html": {"order": ORDER},
+    "order_confirmation_admin.html": {"order": ORDER},
+    "property_enquiry_customer.html": {"enquiry": ENQUIRY, "customer_name": "Kofi Boateng"},
+    "property_enquiry_admin.html": {"enquiry": ENQUIRY, "customer_name": "Kofi Boateng"},
+    "contact_enquiry_customer.html": {"enquiry": ENQUIRY, "customer_name": "Kofi Boateng"},
+    "contact_enquiry_admin.html": {"enquiry": ENQUIRY, "customer_name": "Kofi Boateng"},
+    "newsletter_welcome.html": {"contact_email": "info@myairbanhomes.com"},
+    "newsletter_update.html": {"content": "<p>New homes are available in Tema.</p>" * 5},
+    "admin_new_subscriber.html": {
+        "subscriber_email": "new@example.com",
+        "subscriber_id": "a2b8c1d0-0000-4000-8000-000000000000",
+        "subscription_time": "August 01, 2025 at 10:30 AM",
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="Emit JSON results.")
+    args = parser.parse_args()
+
+    precompile_email_templates()
+
+    # Baseline: no cache and no minification, i.e. rebuild everything per call
+    uncached_env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True, cache_size=0
+    )
+
+    results = []
+    for name in get_email_template_names():
+        context = CONTEXTS[name]
+        cached = timeit.timeit(
+            lambda: render_email_template(name, **context), number=args.iterations
+        )
+        uncached_iterations = max(args.iterations // 20, 1)
+        uncached = timeit.timeit(
+            lambda: uncached_env.get_template(name).render(**context),
+            number=uncached_iterations,
+        )
+        results.append(
+            {
+                "template": name,
+                "cached_render_us": round(cached / args.iterations * 1e6, 1),
+                "uncached_render_us": round(uncached / uncached_iterations * 1e6, 1),
+                "minified_bytes": len(render_email_template(name, **context).encode()),
+                "raw_bytes": len(
+                    uncached_env.get_template(name).render(**context).encode()
+                ),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'template':36} {'cached us':>10} {'uncached us':>12} {'bytes':>8} {'raw bytes':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['template']:36} {r['cached_render_us']:>10} {r['uncached_render_us']:>12} "
+            f"{r['minified_bytes']:>8} {r['raw_bytes']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Endpoint throughput benchmark.
+
+Boots create_app() against an in-process SQLite stand-in for MySQL
+(benchmarks/sqlite_backend.py) with Resend stubbed out, drives each route at
+a fixed concurrency through Flask test clients and reports req/s, latency
+percentiles and DB queries per request. A final phase drains the email outbox
+through the stubbed Resend to measure email throughput.
+
+    python benchmarks/bench_endpoints.py [--concurrency 8] [--requests 400]
+        [--email-latency-ms 50] [--doors 50] [--only "GET /doors"]
+        [--accept-encoding "gzip, br"] [--json] [--output results.json]
+
+JSON output is stable (sorted keys, one entry per scenario) so results can be
+diffed between releases.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Configure the app before it is imported: no background workers, no
+# cross-process state, pool sized per run in main()
+os.environ["EMAIL_OUTBOX_WORKER"] = "false"
+os.environ["METRICS_DIR"] = ""
+os.environ["SLOW_QUERY_LOG"] = "false"
+os.environ["RATELIMIT_STORAGE_URI"] = "memory://"
+
+import resend  # noqa: E402
+
+from sqlite_backend import connect_factory, create_database  # noqa: E402
+
+_counter = threading.local()
+
+
+def _count_query(operation, params, seconds, caller, cursor):
+    _counter.queries = getattr(_counter, "queries", 0) + 1
+
+
+def _stub_resend(latency):
+    sent = {"count": 0}
+    lock = threading.Lock()
+
+    def send(params, options=None):
+        time.sleep(latency)
+        with lock:
+            sent["count"] += len(params) if isinstance(params, list) else 1
+        return {"id": str(uuid.uuid4())}
+
+    resend.Emails.send = send
+    resend.Batch.send = send
+    return sent
+
+
+def _seed_doors(path, count):
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    door_ids = []
+    types = ["Single", "Single Wide", "One and Half", "Double"]
+    for i in range(count):
+        door_id = str(uuid.uuid4())
+        door_ids.append(door_id)
+        conn.execute(
+            """INSERT INTO doors (id, name, description, price, image_url, type, stock)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                door_id,
+                f"Door {i}",
+                "Solid hardwood security door",
+                1500 + i * 10,
+                f"https://example.com/doors/{i}.jpg",
+                types[i % len(types)],
+                10,
+            ),
+        )
+        for j in range(3):
+            conn.execute(
+                "INSERT INTO door_images (id, door_id, image_url) VALUES (?, ?, ?)",
+                (str(uuid.uuid4()), door_id, f"https://example.com/doors/{i}-{j}.jpg"),
+            )
+    conn.commit()
+    conn.close()
+    return door_ids
+
+
+def _scenarios(door_ids):
+    """
+    (name, method, path_fn, body_fn, expected_status). path_fn/body_fn take a
+    per-thread random.Random so runs are reproducible.
+    """
+
+    def order_body(rng):
+        return {
+            "name": "Ama Mensah",
+            "email": "ama@example.com",
+            "phone": "+233200000000",
+            "address": "East Legon, Accra",
+            "items": [
+                {"door_id": rng.choice(door_ids), "quantity": rng.randint(1, 3)}
+                for _ in range(2)
+            ],
+        }
+
+    def person(rng):
+        return {
+            "first_name": "Kofi",
+            "last_name": "Boateng",
+            "email": f"kofi{rng.randint(0, 10**9)}@example.com",
+            "phone": "+233240000000",
+        }
+
+    return [
+        ("GET /doors", "GET", lambda rng: "/doors", None, 200),
+        (
+            "GET /doors/<id>",
+            "GET",
+            lambda rng: f"/doors/{rng.choice(door_ids)}",
+            None,
+            200,
+        ),
+        ("POST /orders", "POST", lambda rng: "/orders", order_body, 201),
+        ("GET /orders", "GET", lambda rng: "/orders?limit=50", None, 200),
+        (
+            "POST /property",
+            "POST",
+            lambda rng: "/property",
+            lambda rng: dict(person(rng), selected_property="Airban Estate, Plot 12"),
+            201,
+        ),
+        ("GET /property", "GET", lambda rng: "/property?limit=50", None, 200),
+        (
+            "POST /contact",
+            "POST",
+            lambda rng: "/contact",
+            lambda rng: dict(person(rng), enquiry_type="General"),
+            201,
+        ),
+        ("GET /contact", "GET", lambda rng: "/contact?limit=50", None, 200),
+        (
+            "POST /subscribe",
+            "POST",
+            lambda rng: "/subscribe",
+            lambda rng: {"email": f"sub-{uuid.uuid4()}@example.com"},
+            201,
+        ),
+        ("GET /stats", "GET", lambda rng: "/stats", None, 200),
+    ]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = int(round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_scenario(app, scenario, total_requests, concurrency, seed, headers=None):
+    name, method, path_fn, body_fn, expected = scenario
+    latencies = []
+    queries = []
+    sizes = []
+    errors = []
+    lock = threading.Lock()
+    per_thread = [total_requests // concurrency] * concurrency
+    for i in range(total_requests % concurrency):
+        per_thread[i] += 1
+
+    def worker(index, count):
+        rng = random.Random(seed * 1000 + index)
+        client = app.test_client()
+        local_latencies, local_queries, local_sizes, local_errors = [], [], [], []
+        for _ in range(count):
+            path = path_fn(rng)
+            body = body_fn(rng) if body_fn else None
+            _counter.queries = 0
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=body, headers=headers)
+            local_latencies.append(time.perf_counter() - start)
+            local_queries.append(_counter.queries)
+            local_sizes.append(len(response.get_data()))
+            if response.status_code != expected:
+                body = response.get_data(as_text=True)[:200]
+                local_errors.append(f"{response.status_code} {body}")
+        with lock:
+            latencies.extend(local_latencies)
+            queries.extend(local_queries)
+            sizes.extend(local_sizes)
+            errors.extend(local_errors)
+
+    threads = [
+        threading.Thread(target=worker, args=(i, count))
+        for i, count in enumerate(per_thread)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "queries_per_request": round(sum(queries) / max(len(queries), 1), 2),
+        "bytes_per_response": round(sum(sizes) / max(len(sizes), 1)),
+    }
+
+
+def run_outbox_drain(app, sent_counter):
+    from app.outbox import dispatch_outbox
+
+    batch_size = app.config["EMAIL_OUTBOX_BATCH_SIZE"]
+    before = sent_counter["count"]
+    start = time.perf_counter()
+    processed = 0
+    with app.app_context():
+        while True:
+            claimed, sent = dispatch_outbox(batch_size)
+            processed += sent
+            if claimed < batch_size:
+                break
+    elapsed = time.perf_counter() - start
+    return {
+        "outbox_emails": processed,
+        "resend_calls": sent_counter["count"] - before,
+        "emails_per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400, help="Per scenario.")
+    parser.add_argument("--email-latency-ms", type=float, default=50)
+    parser.add_argument("--doors", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", action="append", help="Scenario name to run.")
+    parser.add_argument("--accept-encoding", help="Accept-Encoding to send.")
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    parser.add_argument("--output", help="Also write the JSON results here.")
+    args = parser.parse_args()
+
+    os.environ["DB_POOL_SIZE"] = str(args.concurrency)
+    os.environ["DB_POOL_MAX_OVERFLOW"] = "0"
+
+    workdir = tempfile.mkdtemp(prefix="airban-bench-")
+    db_path = os.path.join(workdir, "bench.sqlite3")
+    create_database(db_path)
+    door_ids = _seed_doors(db_path, args.doors)
+    sent_counter = _stub_resend(args.email_latency_ms / 1000)
+
+    import app.models as models
+    from app import create_app, limiter
+    from app.db_pool import QUERY_OBSERVERS
+
+    # Route through the SQLite stand-in and take the rate limiter out of the path
+    real_init_db_pool = models.init_db_pool
+    models.init_db_pool = lambda: real_init_db_pool(connect=connect_factory(db_path))
+    limiter.enabled = False
+    app = create_app()
+    QUERY_OBSERVERS.append(_count_query)
+
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else None
+    results = {}
+    for scenario in _scenarios(door_ids):
+        if args.only and scenario[0] not in args.only:
+            continue
+        # Short warm-up so template compilation and cache fills are not measured
+        run_scenario(app, scenario, min(20, args.requests), 1, args.seed, headers)
+        results[scenario[0]] = run_scenario(
+            app, scenario, args.requests, args.concurrency, args.seed, headers
+        )
+        if not args.json:
+            r = results[scenario[0]]
+            print(
+                f"{scenario[0]:<18} {r['requests_per_second']:>9.1f} req/s  "
+                f"p50 {r['p50_ms']:>7.2f} ms  p95 {r['p95_ms']:>7.2f} ms  "
+                f"p99 {r['p99_ms']:>7.2f} ms  {r['queries_per_request']:>5.2f} q/req  "
+                f"{r['bytes_per_response']:>7} B"
+                + (f"  {r['errors']} errors: {r['first_error']}" if r["errors"] else "")
+            )
+
+    outbox = run_outbox_drain(app, sent_counter)
+    if not args.json:
+        print(
+            f"{'outbox drain':<18} {outbox['emails_per_second']:>9.1f} emails/s  "
+            f"({outbox['outbox_emails']} emails, {outbox['resend_calls']} Resend calls)"
+        )
+
+    report = {
+        "benchmark": "endpoints",
+        "settings": {
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "email_latency_ms": args.email_latency_ms,
+            "doors": args.doors,
+            "seed": args.seed,
+            "accept_encoding": args.accept_encoding,
+            "backend": "sqlite",
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+        "outbox": outbox,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.json:
+        print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
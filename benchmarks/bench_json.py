@@ -0,0 +1,130 @@
+"""
+JSON serialization benchmark.
+
+Builds GET /orders and GET /doors payloads shaped like the dictionary-cursor
+rows the routes return (Decimal prices, datetime timestamps, UUID strings)
+and times jsonify-style responses through Flask's default provider and the
+orjson provider (app/json_provider.py), checking that both decode to the
+same data.
+
+    python benchmarks/bench_json.py [--rows 1000,10000] [--repeat 20]
+        [--json] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app.json_provider import OrjsonProvider, orjson  # noqa: E402
+
+
+def order_rows(count, rng):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "customer_name": "Ama Mensah",
+            "phone_number": "+233200000000",
+            "email": f"customer{i}@example.com",
+            "location": "East Legon, Accra",
+            "total_price": Decimal(rng.randrange(80000, 900000)) / 100,
+            "created_at": start + timedelta(minutes=i),
+            "is_confirmed": rng.randint(0, 1),
+        }
+        for i in range(count)
+    ]
+
+
+def door_rows(count, rng):
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"Door {i}",
+            "price": Decimal(rng.randrange(800, 9000)),
+            "type": rng.choice(["Single", "Single Wide", "One and Half", "Double"]),
+            "image_url": f"https://cdn.example.com/doors/{i}.jpg",
+        }
+        for i in range(count)
+    ]
+
+
+def time_response(app, provider, payload, repeat):
+    timings = []
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = provider.response(payload).get_data()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", default="1000,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    parser.add_argument("--output", help="Also write the JSON results here.")
+    args = parser.parse_args()
+    if orjson is None:
+        sys.exit("orjson is not installed")
+
+    app = Flask(__name__)
+    providers = {"default": DefaultJSONProvider(app), "orjson": OrjsonProvider(app)}
+    rng = random.Random(args.seed)
+
+    results = {}
+    for count in (int(n) for n in args.rows.split(",")):
+        for name, build in [("GET /orders", order_rows), ("GET /doors", door_rows)]:
+            payload = build(count, rng)
+            timings, bodies = {}, {}
+            for provider_name, provider in providers.items():
+                seconds, bodies[provider_name] = time_response(
+                    app, provider, payload, args.repeat
+                )
+                timings[provider_name] = round(seconds * 1000, 3)
+            if json.loads(bodies["default"]) != json.loads(bodies["orjson"]):
+                sys.exit(f"{name} at {count} rows: providers disagree")
+            key = f"{name} x{count}"
+            results[key] = {
+                "rows": count,
+                "bytes": len(bodies["orjson"]),
+                "default_ms": timings["default"],
+                "orjson_ms": timings["orjson"],
+                "speedup": round(timings["default"] / timings["orjson"], 1),
+            }
+            if not args.json:
+                r = results[key]
+                print(
+                    f"{key:<20} default {r['default_ms']:>8.2f} ms  "
+                    f"orjson {r['orjson_ms']:>7.2f} ms  {r['speedup']:>5.1f}x  "
+                    f"({r['bytes']:,} bytes)"
+                )
+
+    report = {
+        "benchmark": "json",
+        "settings": {"rows": args.rows, "repeat": args.repeat, "seed": args.seed},
+        "payloads": results,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.json:
+        print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Query-scaling regression suite for app/models.py.
+
+Grows the database step by step (10k, 100k, 1M orders by default, seeded by
+benchmarks/seed_data.py), and at each scale times the model functions, records
+the query plan of every statement they run and estimates how their cost grows
+with the data. A function whose time grows faster than the data between two
+scales (exponent above --max-exponent) is flagged.
+
+    # In-process SQLite stand-in (fresh database, no setup needed)
+    python benchmarks/bench_query_scaling.py [--scales 10000,100000,1000000]
+
+    # The MySQL database configured in .env (after `flask db upgrade`);
+    # this adds rows to it
+    python benchmarks/bench_query_scaling.py --backend mysql
+
+    [--repeat 3] [--max-exponent 1.2] [--json] [--output results.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ["EMAIL_OUTBOX_WORKER"] = "false"
+os.environ["METRICS_DIR"] = ""
+os.environ["SLOW_QUERY_LOG"] = "false"
+os.environ["RATELIMIT_STORAGE_URI"] = "memory://"
+os.environ["DB_POOL_SIZE"] = "1"
+os.environ["DB_POOL_MAX_OVERFLOW"] = "0"
+
+from seed_data import seed  # noqa: E402
+
+
+def _functions(models, sample):
+    """
+    (name, callable) for each model read to measure. Catalog reads go to the
+    loaders behind the cache so the database is actually hit.
+    """
+    return [
+        ("get_all_doors", models._fetch_all_doors),
+        ("get_door_by_id", lambda: models._fetch_door(sample["door"])),
+        ("get_all_orders", models.get_all_orders),
+        ("get_orders_page", lambda: models.get_orders_page(50)),
+        ("get_order_by_id", lambda: models.get_order_by_id(sample["order"])),
+        ("get_all_property_enquiries", models.get_all_property_enquiries),
+        ("get_property_enquiries_page", lambda: models.get_property_enquiries_page(50)),
+        (
+            "get_property_enquiry_by_id",
+            lambda: models.get_property_enquiry_by_id(sample["property"]),
+        ),
+        ("get_all_contact_enquiries", models.get_all_contact_enquiries),
+        ("get_subscribers_after", lambda: models.get_subscribers_after(None, 100)),
+    ]
+
+
+def _sample_ids(models):
+    sample = {}
+    with models.get_db_cursor() as cursor:
+        for key, table in [
+            ("door", "doors"),
+            ("order", "orders"),
+            ("property", "property_enquiry"),
+        ]:
+            # A row from the middle of the table rather than the first one
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+            offset = cursor.fetchone()["n"] // 2
+            cursor.execute(f"SELECT id FROM {table} LIMIT 1 OFFSET %s", (offset,))
+            sample[key] = cursor.fetchone()["id"]
+    return sample
+
+
+def _explain(models, backend, operation, params):
+    """
+    Summarise the plan of one statement as (steps, rows_examined, full_scans).
+    MySQL reports estimated rows per table; SQLite only names the access path,
+    so rows are left as None there.
+    """
+    with models.get_db_cursor() as cursor:
+        if backend == "mysql":
+            cursor.execute(f"EXPLAIN {operation}", params)
+            plan = cursor.fetchall()
+            steps = [
+                f"{row['table']}:{row['type']}:{row['key'] or '-'}" for row in plan
+            ]
+            rows = sum(int(row.get("rows") or 0) for row in plan)
+            scans = sum(1 for row in plan if row["type"] == "ALL")
+            return steps, rows, scans
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {operation}", params)
+        details = [row["detail"] for row in cursor.fetchall()]
+        scans = sum(
+            1
+            for detail in details
+            if detail.startswith("SCAN") and "USING" not in detail
+        )
+        return details, None, scans
+
+
+def measure(models, backend, functions, repeat):
+    from app.db_pool import QUERY_OBSERVERS
+
+    results = {}
+    for name, func in functions:
+        captured = []
+
+        def capture(operation, params, seconds, caller, cursor):
+            captured.append((operation, params))
+
+        QUERY_OBSERVERS.append(capture)
+        try:
+            func()  # warm-up, and capture the statements once
+        finally:
+            QUERY_OBSERVERS.remove(capture)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+
+        if isinstance(result, tuple):
+            result = result[0]  # (rows, next_cursor) from the *_page functions
+        plans = [_explain(models, backend, op, params) for op, params in captured]
+        rows = [p[1] for p in plans if p[1] is not None]
+        results[name] = {
+            "seconds": round(statistics.median(timings), 6),
+            "rows_returned": len(result) if isinstance(result, list) else 1,
+            "queries": len(captured),
+            "rows_examined_estimate": sum(rows) if rows else None,
+            "full_scans": sum(p[2] for p in plans),
+            "plan": [step for p in plans for step in p[0]],
+        }
+    return results
+
+
+def growth(scales, by_scale, max_exponent):
+    """
+    Per function, the exponent k in time ~ rows^k between consecutive scales.
+    k ~ 0 is constant (index lookup / bounded page), k ~ 1 linear.
+    """
+    report = {}
+    names = by_scale[scales[0]].keys()
+    for name in names:
+        steps = []
+        for low, high in zip(scales, scales[1:]):
+            t_low = max(by_scale[low][name]["seconds"], 1e-6)
+            t_high = max(by_scale[high][name]["seconds"], 1e-6)
+            exponent = math.log(t_high / t_low) / math.log(high / low)
+            steps.append({"from": low, "to": high, "exponent": round(exponent, 2)})
+        report[name] = {
+            "steps": steps,
+            "super_linear": any(step["exponent"] > max_exponent for step in steps),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--scales", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-exponent", type=float, default=1.2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    parser.add_argument("--output", help="Also write the JSON results here.")
+    args = parser.parse_args()
+    scales = sorted(int(s) for s in args.scales.split(","))
+    echo = (lambda *a: None) if args.json else print
+
+    import app.models as models
+    from app import create_app, limiter
+
+    if args.backend == "sqlite":
+        from sqlite_backend import connect_factory, create_database
+
+        db_path = os.path.join(tempfile.mkdtemp(prefix="airban-scale-"), "db.sqlite3")
+        create_database(db_path)
+        real_init_db_pool = models.init_db_pool
+        models.init_db_pool = lambda: real_init_db_pool(connect=connect_factory(db_path))
+
+    limiter.enabled = False
+    app = create_app()
+
+    by_scale = {}
+    with app.app_context():
+        for scale in scales:
+            echo(f"Seeding to {scale:,} orders...")
+            # Seed on an unpooled connection (the pool holds a single one)
+            conn = models.db_pool.open_unpooled()
+            try:
+                if args.backend == "mysql":
+                    conn.autocommit = True
+                seed(conn, scale, args.seed, echo=echo)
+            finally:
+                conn.close()
+
+            functions = _functions(models, _sample_ids(models))
+            by_scale[scale] = measure(models, args.backend, functions, args.repeat)
+            for name, r in by_scale[scale].items():
+                echo(
+                    f"  {name:<30} {r['seconds'] * 1000:>10.2f} ms  "
+                    f"{r['rows_returned']:>8} rows  {r['full_scans']} full scan(s)"
+                )
+
+    report = {
+        "benchmark": "query_scaling",
+        "settings": {
+            "backend": args.backend,
+            "scales": scales,
+            "repeat": args.repeat,
+            "max_exponent": args.max_exponent,
+        },
+        "scales": {str(scale): by_scale[scale] for scale in scales},
+        "growth": growth(scales, by_scale, args.max_exponent) if len(scales) > 1 else {},
+    }
+
+    flagged = [name for name, g in report["growth"].items() if g["super_linear"]]
+    echo("Super-linear: " + (", ".join(flagged) if flagged else "none"))
+
+    output = json.dumps(report, indent=2, sort_keys=True, default=str)
+    if args.json:
+        print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
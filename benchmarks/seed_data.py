@@ -0,0 +1,241 @@
+"""
+Bulk generator for realistic catalog, order, enquiry and subscriber data.
+
+Scale is expressed as a number of orders; the other tables grow with it
+(about 2.5 items per order, one enquiry per order split between property and
+contact enquiries, one subscriber per order, a catalog of up to 500 doors).
+Seeding is additive, so a database can be grown 10k -> 100k -> 1M in steps.
+
+    # Against the MySQL database configured in .env (run `flask db upgrade` first)
+    python benchmarks/seed_data.py --orders 100000
+
+The functions here take any connection exposing the mysql.connector API,
+including benchmarks/sqlite_backend.Connection.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DOOR_TYPES = ["Single", "Single Wide", "One and Half", "Double"]
+FIRST_NAMES = ["Ama", "Kofi", "Akosua", "Kwame", "Esi", "Yaw", "Abena", "Kojo"]
+LAST_NAMES = ["Mensah", "Boateng", "Owusu", "Asante", "Appiah", "Osei", "Addo"]
+LOCATIONS = ["East Legon, Accra", "Kumasi", "Tema", "Takoradi", "Cape Coast"]
+PROPERTIES = ["Airban Estate, Plot 12", "Airban Heights", "Airban Gardens"]
+ENQUIRY_TYPES = ["General", "Pricing", "Installation", "Partnership"]
+
+# Everything is spread over the two years before this point
+END_TIME = datetime(2025, 9, 1)
+SPAN = timedelta(days=730)
+
+INSERTS = {
+    "doors": """INSERT INTO doors
+        (id, name, description, price, image_url, type, stock, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+    "door_images": """INSERT INTO door_images (id, door_id, image_url)
+        VALUES (%s, %s, %s)""",
+    "orders": """INSERT INTO orders
+        (id, customer_name, phone_number, email, location, notes, total_price,
+         created_at, is_confirmed, is_deleted)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    "order_items": """INSERT INTO order_items
+        (id, order_id, door_id, quantity, unit_price, orientation, door_type)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+    "property_enquiry": """INSERT INTO property_enquiry
+        (id, first_name, last_name, email, phone, selected_property, message,
+         resolved, submitted_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    "contact_enquiry": """INSERT INTO contact_enquiry
+        (id, first_name, last_name, email, phone, enquiry_type, additional_info,
+         resolved, submitted_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    "subscribers": "INSERT INTO subscribers (id, email) VALUES (%s, %s)",
+}
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(rng, position):
+    # Roughly chronological (position in [0, 1)) with a little jitter
+    offset = SPAN * position + timedelta(seconds=rng.randint(0, 3600))
+    return (END_TIME - SPAN + offset).replace(microsecond=0)
+
+
+def _person(rng, n):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return first, last, f"{first}.{last}.{n}@example.com".lower()
+
+
+def _count(conn, table):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def _insert(conn, table, rows, chunk_size):
+    cursor = conn.cursor()
+    for i in range(0, len(rows), chunk_size):
+        conn.start_transaction()
+        cursor.executemany(INSERTS[table], rows[i : i + chunk_size])
+        conn.commit()
+    cursor.close()
+
+
+def _load_doors(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, price, type FROM doors WHERE is_deleted = 0")
+    doors = cursor.fetchall()
+    cursor.close()
+    return doors
+
+
+def seed(conn, orders, seed=1, chunk_size=1000, echo=print):
+    """
+    Grow the database to `orders` orders (and proportional related rows).
+    Returns the number of orders added.
+    """
+    existing = _count(conn, "orders")
+    if existing >= orders:
+        return 0
+    # A different stream per step keeps ids unique when growing in stages
+    rng = random.Random(f"{seed}-{existing}")
+    started = time.perf_counter()
+
+    door_target = max(20, min(500, orders // 200))
+    door_count = _count(conn, "doors")
+    if door_count < door_target:
+        doors, images = [], []
+        for n in range(door_count, door_target):
+            door_id = _uuid(rng)
+            doors.append(
+                (
+                    door_id,
+                    f"Door {n}",
+                    "Solid hardwood security door with steel frame",
+                    Decimal(rng.randrange(800, 9000)),
+                    f"https://cdn.example.com/doors/{n}.jpg",
+                    rng.choice(DOOR_TYPES),
+                    rng.randint(0, 40),
+                    _timestamp(rng, n / door_target),
+                )
+            )
+            images += [
+                (_uuid(rng), door_id, f"https://cdn.example.com/doors/{n}-{i}.jpg")
+                for i in range(rng.randint(2, 5))
+            ]
+        _insert(conn, "doors", doors, chunk_size)
+        _insert(conn, "door_images", images, chunk_size)
+    catalog = [(row[0], row[1], row[2]) for row in _load_doors(conn)]
+
+    added = orders - existing
+    # Build and write in blocks so 1M orders never sit in memory at once
+    block = chunk_size * 10
+    for start in range(existing, orders, block):
+        order_rows, item_rows = [], []
+        property_rows, contact_rows, subscriber_rows = [], [], []
+        for n in range(start, min(start + block, orders)):
+            first, last, email = _person(rng, n)
+            created_at = _timestamp(rng, n / orders)
+            order_id = _uuid(rng)
+            total = Decimal(0)
+            for _ in range(rng.choice([1, 1, 2, 2, 3, 4, 5])):
+                door_id, price, door_type = rng.choice(catalog)
+                quantity = rng.randint(1, 4)
+                total += Decimal(str(price)) * quantity
+                item_rows.append(
+                    (
+                        _uuid(rng),
+                        order_id,
+                        door_id,
+                        quantity,
+                        price,
+                        rng.choice(["left", "right"]),
+                        door_type,
+                    )
+                )
+            order_rows.append(
+                (
+                    order_id,
+                    f"{first} {last}",
+                    f"+2332{rng.randint(10000000, 99999999)}",
+                    email,
+                    rng.choice(LOCATIONS),
+                    "" if rng.random() < 0.7 else "Please call before delivery",
+                    total,
+                    created_at,
+                    int(rng.random() < 0.6),
+                    int(rng.random() < 0.02),
+                )
+            )
+            enquiry = (
+                _uuid(rng),
+                first,
+                last,
+                email,
+                f"+2335{rng.randint(10000000, 99999999)}",
+            )
+            resolved = "yes" if rng.random() < 0.5 else "no"
+            if n % 2:
+                property_rows.append(
+                    enquiry
+                    + (rng.choice(PROPERTIES), "Is it still available?", resolved)
+                    + (created_at,)
+                )
+            else:
+                contact_rows.append(
+                    enquiry
+                    + (rng.choice(ENQUIRY_TYPES), "Please get in touch", resolved)
+                    + (created_at,)
+                )
+            subscriber_rows.append((_uuid(rng), f"sub.{n}.{email}"))
+
+        _insert(conn, "orders", order_rows, chunk_size)
+        _insert(conn, "order_items", item_rows, chunk_size)
+        _insert(conn, "property_enquiry", property_rows, chunk_size)
+        _insert(conn, "contact_enquiry", contact_rows, chunk_size)
+        _insert(conn, "subscribers", subscriber_rows, chunk_size)
+        if echo:
+            echo(f"  {min(start + block, orders):>9,} / {orders:,} orders")
+
+    if echo:
+        echo(f"Seeded {added:,} orders in {time.perf_counter() - started:.1f}s")
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the configured MySQL database.")
+    parser.add_argument("--orders", type=int, required=True, help="Target order count.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    import mysql.connector
+
+    from config import Config
+
+    conn = mysql.connector.connect(
+        host=Config.MYSQL_HOST,
+        user=Config.MYSQL_USER,
+        password=Config.MYSQL_PASSWORD,
+        database=Config.MYSQL_DB,
+        autocommit=True,
+    )
+    try:
+        seed(conn, args.orders, args.seed, args.chunk_size)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+In-process stand-in for MySQL used by the benchmarks.
+
+Wraps sqlite3 in the small part of the mysql.connector API that app/models.py
+and app/routes.py use (dictionary cursors, start_transaction, in_transaction,
+ping, %s placeholders) and rewrites the few MySQL-only constructs the app's
+queries contain. Pass `connect_factory(path)` to init_db_pool(connect=...).
+"""
+
+import os
+import re
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+
+import mysql.connector
+from mysql.connector import errorcode
+
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter(
+    "TIMESTAMP", lambda value: datetime.fromisoformat(value.decode("utf-8"))
+)
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "app", "migrations"
+)
+
+# (pattern, replacement) turning the migrations' MySQL DDL into SQLite
+_DDL_REWRITES = [
+    (re.compile(r"\bENUM\([^)]*\)", re.I), "TEXT"),
+    (re.compile(r"\bDECIMAL\(\d+,\s*\d+\)", re.I), "REAL"),
+    (re.compile(r"\bDATETIME\b", re.I), "TIMESTAMP"),
+    (re.compile(r"\bJSON\b", re.I), "TEXT"),
+    (re.compile(r"\s+ON UPDATE CURRENT_TIMESTAMP", re.I), ""),
+    (
+        re.compile(r"^CREATE (UNIQUE )?INDEX (\w+)", re.I),
+        r"CREATE \1INDEX IF NOT EXISTS \2",
+    ),
+]
+# KEY / UNIQUE KEY inside CREATE TABLE become separate CREATE INDEX statements
+_INLINE_KEY = re.compile(r",\s*(UNIQUE )?KEY (\w+) \(([^)]*)\)", re.I)
+_CREATE_TABLE = re.compile(r"^CREATE TABLE IF NOT EXISTS (\w+)", re.I)
+# Every index a migration creates; FULLTEXT ones have no SQLite equivalent
+_INDEX_NAME = re.compile(r"(?<!FULLTEXT )\b(?:INDEX|KEY) (\w+)", re.I)
+
+
+def _migration_sql():
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        if re.match(r"^\d+_\w+\.sql$", filename):
+            with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+                lines = [line for line in f if not line.strip().startswith("--")]
+            yield "".join(lines)
+
+
+def schema_statements():
+    """
+    The app's migrations, in order, rewritten for SQLite so the stand-in has
+    exactly the tables and (non-FULLTEXT) indexes MySQL would.
+    """
+    statements = []
+    for sql in _migration_sql():
+        for statement in re.split(r";\s*$", sql, flags=re.MULTILINE):
+            statement = statement.strip()
+            if not statement or re.match(r"CREATE FULLTEXT", statement, re.I):
+                continue
+            for pattern, replacement in _DDL_REWRITES:
+                statement = pattern.sub(replacement, statement)
+            keys = _INLINE_KEY.findall(statement)
+            statements.append(_INLINE_KEY.sub("", statement))
+            for unique, name, columns in keys:
+                table = _CREATE_TABLE.match(statement).group(1)
+                statements.append(
+                    f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+                )
+    return statements
+
+
+# (pattern, replacement) applied in order after %s -> ?
+_REWRITES = [
+    (re.compile(r"\s+FOR UPDATE( SKIP LOCKED)?", re.I), ""),
+    (re.compile(r"ON DUPLICATE KEY UPDATE", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.I), r"excluded.\1"),
+    (
+        re.compile(r"NOW\(\)\s*\+\s*INTERVAL\s+\?\s+SECOND", re.I),
+        "datetime('now', '+' || ? || ' seconds')",
+    ),
+    (re.compile(r"NOW\(\)", re.I), "datetime('now')"),
+    (re.compile(r"\bIF\(", re.I), "IIF("),
+    (re.compile(r"SELECT DATABASE\(\)", re.I), "SELECT 'benchmark'"),
+]
+
+_translated = {}
+
+
+def translate(operation):
+    sql = _translated.get(operation)
+    if sql is None:
+        sql = operation.replace("%s", "?")
+        for pattern, replacement in _REWRITES:
+            sql = pattern.sub(replacement, sql)
+        _translated[operation] = sql
+    return sql
+
+
+def _params(params):
+    if params is None:
+        return ()
+    return [str(p) if isinstance(p, uuid.UUID) else p for p in params]
+
+
+@contextmanager
+def _mysql_errors():
+    # Unique violations are raised the way mysql.connector raises them, since
+    # the app tells a duplicate from a real failure by the errno
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        if "UNIQUE constraint failed" not in str(e):
+            raise
+        raise mysql.connector.IntegrityError(
+            msg=str(e), errno=errorcode.ER_DUP_ENTRY
+        ) from e
+
+
+class Cursor:
+    def __init__(self, conn, dictionary=False, **_):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        with _mysql_errors():
+            self._cursor.execute(translate(operation), _params(params))
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        with _mysql_errors():
+            self._cursor.executemany(
+                translate(operation), [_params(params) for params in seq_params]
+            )
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Connection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(
+            path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    # Results are always fully buffered by sqlite3
+    unread_result = False
+
+    def start_transaction(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def cursor(self, dictionary=False, **kwargs):
+        return Cursor(self._conn, dictionary=dictionary)
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+def create_database(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for statement in schema_statements():
+        conn.execute(statement)
+    created = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    conn.close()
+    # A statement the rewrites don't understand must not silently lose an index
+    expected = {name for sql in _migration_sql() for name in _INDEX_NAME.findall(sql)}
+    if expected - created:
+        raise RuntimeError(
+            f"Indexes missing from the SQLite schema: {sorted(expected - created)}"
+        )
+
+
+def connect_factory(path):
+    return lambda: Connection(path)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,3 +17,97 @@ class Config:
     RESEND_VERIFIED_DOMAIN = os.getenv("VERIFIED_DOMAIN")
     ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 
+    # MySQL connection pool: requests wait up to DB_POOL_TIMEOUT seconds for a
+    # free connection before failing; overflow connections close when returned
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_MAX_AGE = int(os.getenv("DB_POOL_MAX_AGE", 3600))
+    DB_POOL_PING_IDLE_SECONDS = int(os.getenv("DB_POOL_PING_IDLE_SECONDS", 30))
+
+    # Fast start for serverless cold starts: the pool is created on first DB
+    # access instead of in create_app() and the outbox dispatchers default to
+    # off (email modules load on first send either way). On by default on Vercel.
+    # A cold start (import + create_app + first request) over
+    # STARTUP_BUDGET_MS is logged as a warning; 0 disables the check
+    FAST_START = os.getenv(
+        "FAST_START", "true" if os.getenv("VERCEL") else "false"
+    ).lower() == "true"
+    STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 0))
+
+    # JSON responses: "orjson" (needs the orjson package) or Flask's "default"
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
+    # Response compression for JSON and text bodies of at least
+    # COMPRESSION_MIN_SIZE bytes: brotli (if installed) or gzip per
+    # Accept-Encoding. Catalog bodies are compressed once at maximum level
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+    # Rate limiting: counters live in a memory-mapped file shared by every
+    # worker on the host (app/rate_limit_storage.py) instead of per process
+    RATELIMIT_STORAGE_URI = os.getenv(
+        "RATELIMIT_STORAGE_URI",
+        f"mmap://{os.path.join(tempfile.gettempdir(), 'airban-ratelimit')}",
+    )
+    RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "sliding-window-counter")
+
+    # Prometheus metrics at /metrics. With several gunicorn workers, point
+    # METRICS_DIR at a directory they share so /metrics reports all of them
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_DIR = os.getenv("METRICS_DIR", "")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 10))
+
+    # Slow-query log: statements over the threshold are logged with their
+    # normalized SQL and an EXPLAIN plan taken on a separate connection
+    SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN_COOLDOWN = int(os.getenv("SLOW_QUERY_EXPLAIN_COOLDOWN", 60))
+
+    # Email outbox: emails are queued in MySQL and sent by background workers,
+    # which the serving process starts (python run.py, gunicorn) and
+    # flask outbox work runs standalone. Off by default under FAST_START:
+    # serverless hosts freeze threads between invocations, so drain the outbox
+    # from a scheduler (POST /outbox/dispatch, flask outbox dispatch --drain)
+    EMAIL_OUTBOX_WORKER = os.getenv(
+        "EMAIL_OUTBOX_WORKER", "false" if FAST_START else "true"
+    ).lower() == "true"
+    EMAIL_OUTBOX_WORKERS = int(os.getenv("EMAIL_OUTBOX_WORKERS", 2))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 20))
+    EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", 5))
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 120))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 8))
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30))
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_MAX_SECONDS", 3600))
+
+    # Newsletter campaigns (Resend batch endpoint accepts up to 100 emails per call).
+    # Batch idempotency keys depend on the batch size, so keep it unchanged while
+    # a campaign is pending
+    CAMPAIGN_BATCH_SIZE = int(os.getenv("CAMPAIGN_BATCH_SIZE", 100))
+    CAMPAIGN_CONCURRENCY = int(os.getenv("CAMPAIGN_CONCURRENCY", 2))
+    CAMPAIGN_REQUESTS_PER_SECOND = float(os.getenv("CAMPAIGN_REQUESTS_PER_SECOND", 2))
+    CAMPAIGN_MAX_RETRIES = int(os.getenv("CAMPAIGN_MAX_RETRIES", 5))
+    CAMPAIGN_LEASE_SECONDS = int(os.getenv("CAMPAIGN_LEASE_SECONDS", 300))
+
+    # Door catalog cache (per process); stale entries are served if MySQL fails
+    CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", 300))
+    CATALOG_CACHE_MAX_ENTRIES = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", 1024))
+    CATALOG_CACHE_STALE_TTL = int(os.getenv("CATALOG_CACHE_STALE_TTL", 86400))
+    # Seconds a catalog reload waits for a pool connection when a stale entry
+    # could be served instead (rather than the full DB_POOL_TIMEOUT)
+    CATALOG_CACHE_STALE_WAIT = float(os.getenv("CATALOG_CACHE_STALE_WAIT", 0.5))
+
+    DOOR_BATCH_MAX_IDS = int(os.getenv("DOOR_BATCH_MAX_IDS", 100))
+
+    # Cache-Control for GET /doors and /doors/<id>; lets the edge absorb reads
+    CATALOG_CACHE_CONTROL = os.getenv(
+        "CATALOG_CACHE_CONTROL",
+        "public, max-age=0, s-maxage=60, stale-while-revalidate=300",
+    )
+
+    # Keyset pagination for admin listings (?limit=&cursor=)
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 200))
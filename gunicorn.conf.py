@@ -0,0 +1,50 @@
+"""
+Gunicorn settings for production:
+
+    gunicorn -c gunicorn.conf.py
+
+The app is preloaded in the master and forked into the workers, which share
+its imported code copy-on-write (lower RSS per worker, faster worker boot).
+Forked workers drop every MySQL connection inherited from the master and
+open their own (see os.register_at_fork in app/models.py), and background
+threads (email outbox dispatchers, metrics flush) are started per worker.
+
+Environment: PORT, WEB_CONCURRENCY (workers), GUNICORN_THREADS,
+GUNICORN_PRELOAD (default true), METRICS_DIR (defaults to a temp directory
+shared by the workers so /metrics reports all of them).
+"""
+
+import glob
+import multiprocessing
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+wsgi_app = "run:app"
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+os.environ.setdefault(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "airban-metrics")
+)
+
+
+def on_starting(server):
+    # Snapshots from a previous run's workers would be merged into /metrics
+    metrics_dir = os.environ["METRICS_DIR"]
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "metrics-*.json")):
+            os.remove(path)
+
+
+def post_worker_init(worker):
+    # Started per worker: threads started in the master while it preloads the
+    # app would not exist in the forked workers
+    from app.outbox import start_outbox_workers
+
+    start_outbox_workers(worker.wsgi)
@@ -1,7 +1,14 @@
+import os
+
 from app import create_app
+from app.outbox import start_outbox_workers
 from config import Config
 
 app = create_app()
 
 if __name__ == "__main__":
+    # The debug reloader runs this file in a watcher and a serving child;
+    # only the child sends email
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_outbox_workers(app)
     app.run(debug=True, port=Config.PORT)